@@ -0,0 +1,213 @@
+import bisect
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout: header | bloom filter bits | sorted 16-byte entry digests
+SNAPSHOT_MAGIC = b"FDL1"
+SNAPSHOT_HEADER = struct.Struct("<4sQIQ")  # magic, bit count, hash count, digest count
+DIGEST_SIZE = 16
+
+
+def digest(entry: str) -> bytes:
+    """Hash a denylist entry once; the digest feeds both the filter and the exact set"""
+    return hashlib.blake2b(entry.strip().encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class BloomFilter:
+    """Bloom filter over a writable buffer (bytearray or copy-on-write mmap)"""
+
+    def __init__(self, bits, num_bits: int, num_hashes: int):
+        self.bits = bits
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1024)
+        num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_bits = (num_bits + 7) // 8 * 8
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(bytearray(num_bits // 8), num_bits, num_hashes)
+
+    def _positions(self, d: bytes):
+        # Kirsch-Mitzenmacher double hashing from the two halves of the digest
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, d: bytes):
+        bits = self.bits
+        for pos in self._positions(d):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, d: bytes) -> bool:
+        bits = self.bits
+        for pos in self._positions(d):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class _DigestView:
+    """Read-only sequence over the sorted digest block of a snapshot, for bisect"""
+
+    def __init__(self, buf, offset: int, count: int):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * DIGEST_SIZE
+        return bytes(self.buf[start:start + DIGEST_SIZE])
+
+
+class Denylist:
+    """
+    Probabilistic denylist: a Bloom filter answers "definitely clean" with a
+    single probe, and positives are confirmed against the exact set of digests
+    (sorted in the snapshot, plus any entries added since it was written).
+    """
+
+    def __init__(self, name: str, directory: str, error_rate: float = 0.001):
+        self.name = name
+        self.error_rate = error_rate
+        self.source_path = os.path.join(directory, f"{name}.txt")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        # Journaled additions survive compaction here, so rebuilds from a newer source keep them
+        self.additions_path = os.path.join(directory, f"{name}.additions")
+        # Serializes writers; lookups run lock-free on the event loop
+        self._lock = threading.Lock()
+        self.bloom = BloomFilter.for_capacity(0, error_rate)
+        self.snapshot_digests = _DigestView(b"", 0, 0)
+        self.added = set()
+
+    def __len__(self):
+        return len(self.snapshot_digests) + len(self.added)
+
+    def __contains__(self, entry: str) -> bool:
+        return self._contains_digest(digest(entry))
+
+    def _contains_digest(self, d: bytes) -> bool:
+        if d not in self.bloom:
+            return False
+        if d in self.added:
+            return True
+        digests = self.snapshot_digests
+        i = bisect.bisect_left(digests, d)
+        return i < len(digests) and digests[i] == d
+
+    def load(self):
+        """Map the snapshot (rebuilding it if the source list is newer) and replay the journal"""
+        if self._snapshot_stale():
+            self._build_snapshot(self._read_source() | self._read_additions())
+        if os.path.exists(self.snapshot_path):
+            self._map_snapshot()
+        self._replay_journal()
+        logger.info(f"Denylist '{self.name}' loaded with {len(self)} entries")
+
+    def add(self, entries) -> int:
+        """Add entries in memory and append them to the journal; returns the number of new entries"""
+        with self._lock:
+            new = []
+            for entry in entries:
+                d = digest(entry)
+                if self._contains_digest(d):
+                    continue
+                self.bloom.add(d)
+                self.added.add(d)
+                new.append(d)
+            if new:
+                os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                with open(self.journal_path, "ab") as f:
+                    f.write(b"".join(new))
+            return len(new)
+
+    def compact(self):
+        """Fold journaled additions into a fresh snapshot and remap it"""
+        with self._lock:
+            digests = set(self.snapshot_digests[i] for i in range(len(self.snapshot_digests)))
+            digests |= self.added
+            if self.added:
+                with open(self.additions_path, "ab") as f:
+                    f.write(b"".join(self.added))
+            self._build_snapshot(digests)
+            self._map_snapshot()
+            self.added = set()
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        logger.info(f"Denylist '{self.name}' compacted to {len(self)} entries")
+
+    def _snapshot_stale(self) -> bool:
+        if not os.path.exists(self.source_path):
+            return False
+        if not os.path.exists(self.snapshot_path):
+            return True
+        return os.path.getmtime(self.source_path) > os.path.getmtime(self.snapshot_path)
+
+    def _read_source(self):
+        with open(self.source_path) as f:
+            return {digest(line) for line in f if line.strip()}
+
+    def _read_additions(self):
+        if not os.path.exists(self.additions_path):
+            return set()
+        with open(self.additions_path, "rb") as f:
+            return set(_read_digests(f.read()))
+
+    def _build_snapshot(self, digests):
+        # Leave headroom so incremental additions don't degrade the error rate
+        bloom = BloomFilter.for_capacity(len(digests) * 2, self.error_rate)
+        for d in digests:
+            bloom.add(d)
+
+        tmp_path = self.snapshot_path + ".tmp"
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, bloom.num_bits, bloom.num_hashes, len(digests)))
+            f.write(bloom.bits)
+            f.write(b"".join(sorted(digests)))
+        os.replace(tmp_path, self.snapshot_path)
+        logger.info(f"Denylist '{self.name}' snapshot written with {len(digests)} entries")
+
+    def _map_snapshot(self):
+        with open(self.snapshot_path, "rb") as f:
+            # Copy-on-write mapping: pages load lazily and later additions stay private
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, num_bits, num_hashes, count = SNAPSHOT_HEADER.unpack_from(mapped, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Invalid denylist snapshot: {self.snapshot_path}")
+        bits_offset = SNAPSHOT_HEADER.size
+        digests_offset = bits_offset + num_bits // 8
+        # A replaced mapping is not closed here: lookups in flight may still hold it,
+        # and it is unmapped once the last reference goes
+        self.bloom = BloomFilter(
+            memoryview(mapped)[bits_offset:digests_offset], num_bits, num_hashes
+        )
+        self.snapshot_digests = _DigestView(mapped, digests_offset, count)
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+        for d in _read_digests(data):
+            self.bloom.add(d)
+            self.added.add(d)
+
+
+def _read_digests(data: bytes):
+    for i in range(0, len(data) - DIGEST_SIZE + 1, DIGEST_SIZE):
+        yield data[i:i + DIGEST_SIZE]
@@ -1,27 +1,49 @@
 import logging
+import os
 import random
 import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Header
 from pydantic import BaseModel
 from opentelemetry import trace
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
+
+import telemetry
+from denylist import Denylist
+
+# Setup OpenTelemetry (before logging so the trace-aware log format applies)
+telemetry.setup("fraud-service", instrumentors=["logging"])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Fraud Detection Service")
+# Denylists: <name>.txt (one entry per line) is compiled into a memory-mapped <name>.snapshot
+DENYLIST_DIR = os.getenv("FRAUD_DENYLIST_DIR", "/data/denylist")
+denylists = {
+    "user": Denylist("users", DENYLIST_DIR),
+    "card": Denylist("cards", DENYLIST_DIR),
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    for denylist in denylists.values():
+        denylist.load()
+    yield
 
-# Auto-instrumentation
-LoggingInstrumentor().instrument(set_logging_format=True)
-FastAPIInstrumentor.instrument_app(app)
+app = FastAPI(title="Fraud Detection Service", lifespan=lifespan)
+
+telemetry.instrument_app(app)
 
 tracer = trace.get_tracer(__name__)
 
 class FraudCheckRequest(BaseModel):
     user_id: int
     total_amount: float
+    card_number: str | None = None
+
+class DenylistUpdate(BaseModel):
+    entries: list[str]
 
 @app.get("/health")
 async def health():
@@ -41,6 +63,19 @@ async def check_fraud(request: FraudCheckRequest, x_chaos_scenario: str | None =
             logger.error(f"[Error] ML model processing timeout: {latency:.2f}s")
             time.sleep(latency)
 
+        # Denylist screening: clean requests cost one Bloom filter probe per list
+        if str(request.user_id) in denylists["user"]:
+            logger.error(f"[Error] Denylisted user {request.user_id}")
+            span.set_attribute("fraud.detected", True)
+            span.set_attribute("fraud.denylist", "user")
+            return {"is_fraud": True, "reason": "User is denylisted"}
+
+        if request.card_number and request.card_number in denylists["card"]:
+            logger.error(f"[Error] Denylisted card ending in {request.card_number[-4:]}")
+            span.set_attribute("fraud.detected", True)
+            span.set_attribute("fraud.denylist", "card")
+            return {"is_fraud": True, "reason": "Card is denylisted"}
+
         # Check for suspicious user patterns
         # Reject orders from users with ID starting with '4' (e.g., 4, 42, 404)
         if str(request.user_id).startswith("4"):
@@ -57,3 +92,19 @@ async def check_fraud(request: FraudCheckRequest, x_chaos_scenario: str | None =
         logger.info("No fraud detected")
         span.set_attribute("fraud.detected", False)
         return {"is_fraud": False, "reason": "Clean"}
+
+# Admin endpoints are plain functions so their file I/O and rebuilds run in the threadpool
+@app.post("/admin/denylist/{kind}")
+def add_to_denylist(kind: str, update: DenylistUpdate):
+    if kind not in denylists:
+        raise HTTPException(status_code=404, detail=f"Unknown denylist: {kind}")
+    added = denylists[kind].add(update.entries)
+    logger.info(f"Added {added} entries to {kind} denylist")
+    return {"denylist": kind, "added": added, "size": len(denylists[kind])}
+
+@app.post("/admin/denylist/{kind}/snapshot")
+def snapshot_denylist(kind: str):
+    if kind not in denylists:
+        raise HTTPException(status_code=404, detail=f"Unknown denylist: {kind}")
+    denylists[kind].compact()
+    return {"denylist": kind, "size": len(denylists[kind])}
@@ -0,0 +1,127 @@
+"""
+Shared OpenTelemetry bootstrap for the Python services.
+
+Replaces both `opentelemetry-instrument` (which imports every installed
+instrumentor at startup) and hand-wired providers. Exporters and
+instrumentors are imported only when the environment or the caller asks for
+them, and each import is timed so cold-start cost is visible in the logs.
+
+Configuration follows the standard OTEL_* environment variables
+(OTEL_SERVICE_NAME, OTEL_TRACES_EXPORTER, OTEL_METRICS_EXPORTER,
+OTEL_LOGS_EXPORTER, OTEL_EXPORTER_OTLP_ENDPOINT, OTEL_TRACES_SAMPLER, ...).
+
+Usage, before any loggers are configured:
+
+    import telemetry
+    telemetry.setup("fraud-service", instrumentors=["logging"])
+    app = FastAPI()
+    telemetry.instrument_app(app)
+"""
+import importlib
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Instrumentor name -> (module, class)
+INSTRUMENTORS = {
+    "httpx": ("opentelemetry.instrumentation.httpx", "HTTPXClientInstrumentor"),
+    "sqlite3": ("opentelemetry.instrumentation.sqlite3", "SQLite3Instrumentor"),
+    "logging": ("opentelemetry.instrumentation.logging", "LoggingInstrumentor"),
+}
+
+# Import time in milliseconds per module, in import order
+timings = {}
+
+
+def _import(module: str):
+    start = time.perf_counter()
+    imported = importlib.import_module(module)
+    timings.setdefault(module, (time.perf_counter() - start) * 1000)
+    return imported
+
+
+def _exporter_enabled(signal: str) -> bool:
+    return os.getenv(f"OTEL_{signal}_EXPORTER", "otlp").strip().lower() == "otlp"
+
+
+def _setup_traces(resource, span_processor_factory):
+    trace = _import("opentelemetry.trace")
+    sdk_trace = _import("opentelemetry.sdk.trace")
+
+    provider = sdk_trace.TracerProvider(resource=resource)
+    if _exporter_enabled("TRACES"):
+        exporter = _import("opentelemetry.exporter.otlp.proto.grpc.trace_exporter").OTLPSpanExporter()
+        if span_processor_factory is None:
+            span_processor_factory = _import("opentelemetry.sdk.trace.export").BatchSpanProcessor
+        provider.add_span_processor(span_processor_factory(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def _setup_metrics(resource):
+    if not _exporter_enabled("METRICS"):
+        return
+    metrics = _import("opentelemetry.metrics")
+    sdk_metrics = _import("opentelemetry.sdk.metrics")
+    metrics_export = _import("opentelemetry.sdk.metrics.export")
+
+    exporter = _import("opentelemetry.exporter.otlp.proto.grpc.metric_exporter").OTLPMetricExporter()
+    reader = metrics_export.PeriodicExportingMetricReader(exporter)
+    metrics.set_meter_provider(sdk_metrics.MeterProvider(resource=resource, metric_readers=[reader]))
+
+
+def _setup_logs(resource):
+    auto = os.getenv("OTEL_PYTHON_LOGGING_AUTO_INSTRUMENTATION_ENABLED", "false").lower() == "true"
+    if not auto or not _exporter_enabled("LOGS"):
+        return
+    logs = _import("opentelemetry._logs")
+    sdk_logs = _import("opentelemetry.sdk._logs")
+    logs_export = _import("opentelemetry.sdk._logs.export")
+
+    exporter = _import("opentelemetry.exporter.otlp.proto.grpc._log_exporter").OTLPLogExporter()
+    provider = sdk_logs.LoggerProvider(resource=resource)
+    provider.add_log_record_processor(logs_export.BatchLogRecordProcessor(exporter))
+    logs.set_logger_provider(provider)
+    logging.getLogger().addHandler(sdk_logs.LoggingHandler(logger_provider=provider))
+
+
+def setup(service_name: str, instrumentors=(), span_processor_factory=None):
+    """
+    Configure tracer, meter and logger providers and apply the named
+    instrumentors. `span_processor_factory(exporter)` overrides the default
+    BatchSpanProcessor.
+    """
+    start = time.perf_counter()
+
+    resources = _import("opentelemetry.sdk.resources")
+    resource = resources.Resource.create(
+        {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+    )
+    _setup_traces(resource, span_processor_factory)
+    _setup_metrics(resource)
+
+    for name in instrumentors:
+        module, cls = INSTRUMENTORS[name]
+        instrumentor = getattr(_import(module), cls)()
+        if name == "logging":
+            instrumentor.instrument(set_logging_format=True)
+        else:
+            instrumentor.instrument()
+
+    # After the logging instrumentor: a root handler would turn its basicConfig() into a no-op
+    _setup_logs(resource)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+    logger.info(
+        f"Telemetry bootstrap for {service_name} took {elapsed:.1f}ms; slowest imports: "
+        + ", ".join(f"{module}={ms:.1f}ms" for module, ms in slowest)
+    )
+
+
+def instrument_app(app):
+    """Instrument a FastAPI app created after setup()"""
+    start = time.perf_counter()
+    _import("opentelemetry.instrumentation.fastapi").FastAPIInstrumentor.instrument_app(app)
+    logger.info(f"FastAPI instrumentation took {(time.perf_counter() - start) * 1000:.1f}ms")
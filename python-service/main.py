@@ -9,6 +9,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import httpx
 
+import telemetry
+
+# Setup OpenTelemetry (before logging so the trace-aware log format applies)
+telemetry.setup("python-fastapi-service", instrumentors=["httpx", "sqlite3", "logging"])
+
 # Configure logging - log format is set by OTEL_PYTHON_LOG_FORMAT environment variable
 # Trace context injection is enabled by OTEL_PYTHON_LOGGING_AUTO_INSTRUMENTATION_ENABLED
 logging.basicConfig(
@@ -47,6 +52,7 @@ async def lifespan(app: FastAPI):
     await httpx_client.aclose()
 
 app = FastAPI(title="Python Order Service", lifespan=lifespan)
+telemetry.instrument_app(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -125,7 +131,7 @@ async def create_order(order: Order, x_chaos_scenario: str | None = Header(defau
         
         fraud_response = await httpx_client.post(
             "http://fraud-service:5000/fraud/check",
-            json={"user_id": order.user_id, "total_amount": estimated_amount}
+            json={"user_id": order.user_id, "total_amount": estimated_amount, "card_number": order.card_number}
         )
         fraud_result = fraud_response.json()
         logger.info(f"Fraud check result: {fraud_result}")
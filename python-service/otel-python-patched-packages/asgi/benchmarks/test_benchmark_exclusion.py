@@ -0,0 +1,80 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
+from opentelemetry.sdk.trace import TracerProvider
+
+SCOPE = {
+    "type": "http",
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/health",
+    "root_path": "",
+    "query_string": b"",
+    "server": ("127.0.0.1", 8000),
+    "client": ("10.0.0.1", 32767),
+    "headers": [
+        (b"host", b"shipping-service:8000"),
+        (b"user-agent", b"kube-probe/1.29"),
+        (b"accept", b"*/*"),
+        (b"connection", b"close"),
+    ],
+}
+
+
+async def _app(scope, receive, send):
+    pass
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+def _probe(middleware):
+    # The app never suspends, so the coroutine finishes on the first step
+    coroutine = middleware(dict(SCOPE), _receive, _send)
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+def test_excluded_probe_path_pattern(benchmark):
+    middleware = OpenTelemetryMiddleware(
+        _app, excluded_urls="health,metrics", tracer_provider=TracerProvider()
+    )
+    benchmark(_probe, middleware)
+
+
+def test_excluded_probe_url_pattern(benchmark):
+    # Anchored on the URL, so only the full URL check can exclude it
+    middleware = OpenTelemetryMiddleware(
+        _app,
+        excluded_urls="^http://shipping-service:8000/health",
+        tracer_provider=TracerProvider(),
+    )
+    benchmark(_probe, middleware)
+
+
+def test_traced_request(benchmark):
+    middleware = OpenTelemetryMiddleware(
+        _app, tracer_provider=TracerProvider()
+    )
+    benchmark(_probe, middleware)
@@ -0,0 +1,60 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from opentelemetry.instrumentation.asgi import asgi_getter, asgi_setter
+
+TRACEPARENT = b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+TYPICAL = {
+    "headers": [
+        (b"host", b"orders.example.com"),
+        (b"user-agent", b"python-httpx/0.27.0"),
+        (b"accept", b"*/*"),
+        (b"accept-encoding", b"gzip, deflate"),
+        (b"connection", b"keep-alive"),
+        (b"content-type", b"application/json"),
+        (b"content-length", b"42"),
+        (b"traceparent", TRACEPARENT),
+    ]
+}
+
+# Mixed-case names of the same length as the looked-up keys, and values
+# that are not valid UTF-8, ahead of the headers actually looked up
+ADVERSARIAL = {
+    "headers": [
+        (f"X-Padding-{i:02}".encode(), b"\xff\xfe" * 32) for i in range(64)
+    ]
+    + [
+        (b"Content-Length", b"42"),
+        (b"TraceParent", TRACEPARENT),
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "carrier", [TYPICAL, ADVERSARIAL], ids=["typical", "adversarial"]
+)
+@pytest.mark.parametrize("key", ["traceparent", "content-length", "missing"])
+def test_getter_get(benchmark, carrier, key):
+    benchmark(asgi_getter.get, carrier, key)
+
+
+def test_setter_set(benchmark):
+    def inject():
+        asgi_setter.set({}, "traceresponse", TRACEPARENT.decode())
+
+    benchmark(inject)
@@ -0,0 +1,130 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tracemalloc
+
+from opentelemetry.instrumentation.asgi import (
+    OpenTelemetryMiddleware,
+    _ASGIHeaderIndex,
+    _RequestFacts,
+    asgi_getter,
+    collect_request_attributes,
+    get_host_port_url_tuple,
+)
+from opentelemetry.propagate import extract
+from opentelemetry.sdk.trace import TracerProvider
+
+# A browser-like request: 32 headers, trace context near the end
+SCOPE = {
+    "type": "http",
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/orders",
+    "root_path": "",
+    "query_string": b"page=1",
+    "server": ("127.0.0.1", 8000),
+    "client": ("127.0.0.1", 32767),
+    "headers": [
+        (f"X-Custom-Header-{i}".encode(), f"value-{i}".encode())
+        for i in range(26)
+    ]
+    + [
+        (b"Host", b"orders.example.com"),
+        (b"User-Agent", b"Mozilla/5.0 (X11; Linux x86_64)"),
+        (b"Accept", b"application/json"),
+        (b"Content-Length", b"128"),
+        (
+            b"traceparent",
+            b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        ),
+        (b"tracestate", b"congo=t61rcWkgMzE"),
+    ],
+}
+
+
+def _per_request_scope_lookups():
+    get_host_port_url_tuple(SCOPE)
+    collect_request_attributes(SCOPE)
+    extract(SCOPE, getter=asgi_getter)
+    asgi_getter.get(SCOPE, "content-length")
+
+
+def _per_request_index_lookups():
+    headers = _ASGIHeaderIndex(SCOPE["headers"])
+    collect_request_attributes(
+        SCOPE, request_facts=_RequestFacts(SCOPE, headers)
+    )
+    extract(headers, getter=asgi_getter)
+    headers.get("content-length")
+
+
+def test_header_lookups_from_scope(benchmark):
+    benchmark(_per_request_scope_lookups)
+
+
+def test_header_lookups_from_index(benchmark):
+    benchmark(_per_request_index_lookups)
+
+
+async def _app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+def _request(middleware):
+    # The app never suspends, so the coroutine finishes on the first step
+    coroutine = middleware(dict(SCOPE), _receive, _send)
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+def _allocated_bytes(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_header_lookups_allocations(benchmark):
+    for func in (_per_request_scope_lookups, _per_request_index_lookups):
+        func()
+        benchmark.extra_info[f"{func.__name__}_peak_allocated_bytes"] = (
+            _allocated_bytes(func)
+        )
+    benchmark(_per_request_index_lookups)
+
+
+def test_request(benchmark):
+    middleware = OpenTelemetryMiddleware(
+        _app, tracer_provider=TracerProvider()
+    )
+    _request(middleware)
+    benchmark.extra_info["peak_allocated_bytes"] = _allocated_bytes(
+        _request, middleware
+    )
+    benchmark(_request, middleware)
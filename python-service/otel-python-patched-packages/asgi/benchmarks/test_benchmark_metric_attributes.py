@@ -0,0 +1,66 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from opentelemetry.instrumentation._semconv import _StabilityMode
+from opentelemetry.instrumentation.asgi import (
+    _MetricAttributesCache,
+    _parse_active_request_count_attrs,
+    _parse_duration_attrs,
+    collect_request_attributes,
+)
+from opentelemetry.semconv.trace import SpanAttributes
+
+SCOPE = {
+    "type": "http",
+    "http_version": "1.1",
+    "method": "POST",
+    "scheme": "http",
+    "path": "/ship",
+    "query_string": b"",
+    "server": ("127.0.0.1", 8000),
+    "client": ("10.0.0.1", 32767),
+    "headers": [
+        (b"host", b"shipping-service:8000"),
+        (b"user-agent", b"python-httpx/0.27.0"),
+    ],
+}
+TARGET = "/ship"
+ATTRIBUTES = collect_request_attributes(SCOPE, _StabilityMode.HTTP_DUP)
+ATTRIBUTES[SpanAttributes.HTTP_STATUS_CODE] = 200
+ATTRIBUTES["http.response.status_code"] = 200
+ATTRIBUTES["http.route"] = TARGET
+
+
+def _filtered():
+    _parse_active_request_count_attrs(ATTRIBUTES, _StabilityMode.HTTP_DUP)
+    duration_attrs_old = _parse_duration_attrs(
+        ATTRIBUTES, _StabilityMode.DEFAULT
+    )
+    duration_attrs_old[SpanAttributes.HTTP_TARGET] = TARGET
+    _parse_duration_attrs(ATTRIBUTES, _StabilityMode.HTTP)
+
+
+def test_metric_attributes_filtered(benchmark):
+    benchmark(_filtered)
+
+
+def test_metric_attributes_cached(benchmark):
+    cache = _MetricAttributesCache(_StabilityMode.HTTP_DUP)
+
+    def cached():
+        cache.active_request_count_attrs(ATTRIBUTES)
+        cache.duration_attrs(ATTRIBUTES, TARGET)
+
+    benchmark(cached)
@@ -0,0 +1,87 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+SCOPE = {
+    "type": "http",
+    "http_version": "1.1",
+    "method": "POST",
+    "scheme": "http",
+    "path": "/ship",
+    "root_path": "",
+    "query_string": b"",
+    "server": ("127.0.0.1", 8000),
+    "client": ("10.0.0.1", 32767),
+    "headers": [
+        (b"host", b"shipping-service:8000"),
+        (b"user-agent", b"python-httpx/0.27.0"),
+        (b"content-type", b"application/json"),
+        (b"content-length", b"42"),
+    ],
+}
+
+
+async def _app(scope, receive, send):
+    await receive()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-length", b"2")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"{}"}
+
+
+async def _send(message):
+    pass
+
+
+def _request(middleware):
+    # The app never suspends, so the coroutine finishes on the first step
+    coroutine = middleware(dict(SCOPE), _receive, _send)
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+def test_request_one_percent_sampled(benchmark):
+    tracer_provider = TracerProvider(
+        sampler=ParentBased(TraceIdRatioBased(0.01))
+    )
+    middleware = OpenTelemetryMiddleware(_app, tracer_provider=tracer_provider)
+    benchmark(_request, middleware)
+
+
+def test_request_always_sampled(benchmark):
+    middleware = OpenTelemetryMiddleware(
+        _app, tracer_provider=TracerProvider()
+    )
+    benchmark(_request, middleware)
+
+
+def test_request_always_sampled_slow_request_threshold(benchmark):
+    middleware = OpenTelemetryMiddleware(
+        _app, tracer_provider=TracerProvider(), slow_request_threshold=1.0
+    )
+    benchmark(_request, middleware)
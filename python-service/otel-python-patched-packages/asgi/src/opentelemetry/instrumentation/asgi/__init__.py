@@ -204,16 +204,45 @@ will replace the value of headers such as ``session-id`` and ``set-cookie`` with
 Note:
     The environment variable names used to capture HTTP headers are still experimental, and thus are subject to change.
 
+Load-adaptive sampling
+**********************
+With ``adaptive_sampling``, the middleware sheds traces while the service is
+saturated. The sampling rate falls as the requests in flight or the event loop
+lag rise, and is exported as the ``http.server.sampling.effective_rate`` gauge.
+Requests that are shed propagate an unsampled context; requests continuing a
+sampled trace are never shed. If a shed request fails, its server span is
+still recorded, without children, when it finishes. The loop lag probe stops
+when the application's lifespan shuts down.
+
+.. code-block:: python
+
+    from opentelemetry.instrumentation.asgi import (
+        LoadAdaptiveSampling,
+        OpenTelemetryMiddleware,
+    )
+
+    app = OpenTelemetryMiddleware(
+        app,
+        adaptive_sampling=LoadAdaptiveSampling(
+            max_active_requests=200, max_loop_lag=0.05
+        ),
+    )
+
 API
 ---
 """
 
 from __future__ import annotations
 
+import random
+import re
+import sys
+import time
 import typing
 import urllib
+import weakref
 from collections import defaultdict
-from functools import wraps
+from functools import lru_cache, wraps
 from timeit import default_timer
 from typing import Any, Awaitable, Callable, DefaultDict, Tuple
 
@@ -246,6 +275,7 @@ from opentelemetry.instrumentation._semconv import (
     _set_status,
     _StabilityMode,
 )
+from opentelemetry.instrumentation.asgi.sampling import LoadAdaptiveSampling
 from opentelemetry.instrumentation.asgi.types import (
     ClientRequestHook,
     ClientResponseHook,
@@ -256,7 +286,8 @@ from opentelemetry.instrumentation.propagators import (
     get_global_response_propagator,
 )
 from opentelemetry.instrumentation.utils import _start_internal_or_server_span
-from opentelemetry.metrics import get_meter
+from opentelemetry.metrics import Observation, get_meter
+from opentelemetry.propagate import extract
 from opentelemetry.propagators.textmap import Getter, Setter
 from opentelemetry.semconv._incubating.metrics.http_metrics import (
     create_http_server_active_requests,
@@ -268,7 +299,14 @@ from opentelemetry.semconv.metrics.http_metrics import (
     HTTP_SERVER_REQUEST_DURATION,
 )
 from opentelemetry.semconv.trace import SpanAttributes
-from opentelemetry.trace import Span, set_span_in_context
+from opentelemetry.trace import (
+    NonRecordingSpan,
+    Span,
+    SpanContext,
+    TraceFlags,
+    set_span_in_context,
+)
+from opentelemetry.trace.status import Status, StatusCode
 from opentelemetry.util.http import (
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SANITIZE_FIELDS,
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_REQUEST,
@@ -285,6 +323,123 @@ from opentelemetry.util.http import (
 )
 
 
+@lru_cache(maxsize=256)
+def _encode_header_name(key: str) -> bytes:
+    """Returns the lower-case ASGI byte form of a header name."""
+    return key.lower().encode("utf-8")
+
+
+class _ASGIHeaderIndex:
+    """Headers of an ASGI scope or message, indexed once by lower-case byte name.
+
+    Building the index touches every header once without decoding it; values
+    are decoded only when looked up. The middleware builds one index per
+    request and shares it between URL construction, attribute collection,
+    context propagation and custom header capture.
+    """
+
+    __slots__ = ("raw", "_index")
+
+    def __init__(self, raw_headers):
+        self.raw = raw_headers
+        index: dict[bytes, list[bytes]] = {}
+        if raw_headers:
+            for key, value in raw_headers:
+                key = key.lower()
+                values = index.get(key)
+                if values is None:
+                    index[key] = [value]
+                else:
+                    values.append(value)
+        self._index = index
+
+    def get(self, key: str) -> typing.Optional[typing.List[str]]:
+        if not key.isascii():
+            return _get_decoded_header(self.raw, key)
+        values = self._index.get(_encode_header_name(key))
+        if not values:
+            return None
+        return [_decode_header_item(value) for value in values]
+
+    def keys(self) -> typing.List[str]:
+        return [_decode_header_item(key) for key in self._index]
+
+    def items(self):
+        return self._index.items()
+
+
+def _get_decoded_header(raw_headers, key: str):
+    """Looks up `key` by decoding every header name, for non-ASCII names
+    whose raw bytes may not be UTF-8."""
+    key = key.lower()
+    decoded = [
+        _decode_header_item(_value)
+        for (_key, _value) in raw_headers or ()
+        if _decode_header_item(_key).lower() == key
+    ]
+    return decoded or None
+
+
+def _get_header_index(
+    carrier: dict, index: typing.Optional[_ASGIHeaderIndex] = None
+) -> _ASGIHeaderIndex:
+    """Returns `index` if it still describes the carrier's headers, else a new index."""
+    raw_headers = carrier.get("headers")
+    if index is not None and index.raw is raw_headers:
+        return index
+    return _ASGIHeaderIndex(raw_headers)
+
+
+# Constructs whose match depends on text before the match position. A pattern
+# without them that matches the path also matches the URL ending in that path.
+_LEFT_CONTEXT_RE = re.compile(r"\^|\\[AbB]|\(\?<[=!]")
+
+# Bound on the number of distinct excluded paths remembered by the fast path
+_MAX_EXCLUDED_PATHS = 1024
+
+
+class _ExcludedPathMatcher:
+    """Matches `ExcludeList` patterns against the raw scope path.
+
+    `ExcludeList.url_disabled` searches the full URL, which the middleware
+    would have to build from the host header first. Patterns that do not
+    look left of their match give the same answer for the path alone, so
+    they are combined into one regex and tried on `scope["path"]`; paths
+    found excluded are remembered so repeated probes are a set lookup.
+    A miss is not conclusive and falls back to the full URL check.
+    """
+
+    __slots__ = ("_regex", "_paths")
+
+    def __init__(self, patterns: typing.Iterable[str]):
+        patterns = [
+            pattern
+            for pattern in patterns
+            if pattern and not _LEFT_CONTEXT_RE.search(pattern)
+        ]
+        self._regex = re.compile("|".join(patterns)) if patterns else None
+        self._paths: set[str] = set()
+
+    @classmethod
+    def from_exclude_list(
+        cls, excluded_urls
+    ) -> typing.Optional[_ExcludedPathMatcher]:
+        patterns = getattr(excluded_urls, "_excluded_urls", None)
+        if not patterns:
+            return None
+        matcher = cls(patterns)
+        return matcher if matcher._regex is not None else None
+
+    def excluded(self, path: str) -> bool:
+        if path in self._paths:
+            return True
+        if not self._regex.search(path):
+            return False
+        if len(self._paths) < _MAX_EXCLUDED_PATHS:
+            self._paths.add(path)
+        return True
+
+
 class ASGIGetter(Getter[dict]):
     def get(
         self, carrier: dict, key: str
@@ -293,28 +448,37 @@ class ASGIGetter(Getter[dict]):
         scope.
 
         Args:
-            carrier: ASGI scope object
+            carrier: ASGI scope object, or a header index built from one
             key: header name in scope
         Returns:
             A list with a single string with the header value if it exists,
                 else None.
         """
+        if isinstance(carrier, _ASGIHeaderIndex):
+            return carrier.get(key)
+
         headers = carrier.get("headers")
         if not headers:
             return None
+        if not key.isascii():
+            return _get_decoded_header(headers, key)
 
-        # ASGI header keys are in lower case
-        key = key.lower()
+        # ASGI header keys are in lower case; compare bytes and decode
+        # only the matched values
+        name = _encode_header_name(key)
+        size = len(name)
         decoded = [
             _decode_header_item(_value)
             for (_key, _value) in headers
-            if _decode_header_item(_key).lower() == key
+            if len(_key) == size and (_key == name or _key.lower() == name)
         ]
         if not decoded:
             return None
         return decoded
 
     def keys(self, carrier: dict) -> typing.List[str]:
+        if isinstance(carrier, _ASGIHeaderIndex):
+            return carrier.keys()
         headers = carrier.get("headers") or []
         return [_decode_header_item(_key) for (_key, _value) in headers]
 
@@ -338,27 +502,69 @@ class ASGISetter(Setter[dict]):
             headers = []
             carrier["headers"] = headers
 
-        headers.append([key.lower().encode(), value.encode()])
+        headers.append([_encode_header_name(key), value.encode()])
 
 
 asgi_setter = ASGISetter()
 
 
+class _RequestFacts:
+    """Request properties derived from an ASGI scope once per request.
+
+    Exclusion, span naming and attribute collection all read from one
+    instance instead of each rebuilding the URL and decoding the query.
+    """
+
+    __slots__ = (
+        "headers",
+        "server_host",
+        "port",
+        "scheme",
+        "path",
+        "query_string",
+        "url",
+        "method",
+        "sanitized_method",
+    )
+
+    def __init__(self, scope, headers=None):
+        self.headers = _get_header_index(scope, headers)
+        self.server_host, self.port, self.url = get_host_port_url_tuple(
+            scope, headers=self.headers
+        )
+        self.scheme = scope.get("scheme")
+        self.path = scope.get("path")
+        query_string = scope.get("query_string")
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode("utf8")
+        self.query_string = query_string
+        self.method = scope.get("method", "")
+        self.sanitized_method = sanitize_method(self.method.strip())
+
+    @property
+    def full_url(self):
+        """The URL including the unquoted query string."""
+        if self.query_string and self.url:
+            return self.url + "?" + urllib.parse.unquote(self.query_string)
+        return self.url
+
+
 # pylint: disable=too-many-branches
 def collect_request_attributes(
-    scope, sem_conv_opt_in_mode=_StabilityMode.DEFAULT
+    scope, sem_conv_opt_in_mode=_StabilityMode.DEFAULT, *, request_facts=None
 ):
     """Collects HTTP request attributes from the ASGI scope and returns a
-    dictionary to be used as span creation attributes."""
-    server_host, port, http_url = get_host_port_url_tuple(scope)
-    query_string = scope.get("query_string")
-    if query_string and http_url:
-        if isinstance(query_string, bytes):
-            query_string = query_string.decode("utf8")
-        http_url += "?" + urllib.parse.unquote(query_string)
+    dictionary to be used as span creation attributes.
+
+    `request_facts` is an optional `_RequestFacts` of the scope, reused
+    instead of deriving the URL, query and method again."""
+    facts = request_facts or _RequestFacts(scope)
+    server_host, port = facts.server_host, facts.port
+    http_url = facts.full_url
+    query_string = facts.query_string
     result = {}
 
-    scheme = scope.get("scheme")
+    scheme = facts.scheme
     if scheme:
         _set_http_scheme(result, scheme, sem_conv_opt_in_mode)
     if server_host:
@@ -368,7 +574,7 @@ def collect_request_attributes(
     flavor = scope.get("http_version")
     if flavor:
         _set_http_flavor_version(result, flavor, sem_conv_opt_in_mode)
-    path = scope.get("path")
+    path = facts.path
     if path:
         _set_http_target(
             result, path, path, query_string, sem_conv_opt_in_mode
@@ -380,22 +586,22 @@ def collect_request_attributes(
                 redact_url(http_url),
                 _StabilityMode.DEFAULT,
             )
-    http_method = scope.get("method", "")
+    http_method = facts.method
     if http_method:
         _set_http_method(
             result,
             http_method,
-            sanitize_method(http_method),
+            facts.sanitized_method,
             sem_conv_opt_in_mode,
         )
 
-    http_host_value_list = asgi_getter.get(scope, "host")
+    http_host_value_list = facts.headers.get("host")
     if http_host_value_list:
         if _report_old(sem_conv_opt_in_mode):
             result[SpanAttributes.HTTP_SERVER_NAME] = ",".join(
                 http_host_value_list
             )
-    http_user_agent = asgi_getter.get(scope, "user-agent")
+    http_user_agent = facts.headers.get("user-agent")
     if http_user_agent:
         _set_http_user_agent(result, http_user_agent[0], sem_conv_opt_in_mode)
 
@@ -418,6 +624,7 @@ def collect_custom_headers_attributes(
     sanitize: SanitizeValue,
     header_regexes: list[str],
     normalize_names: Callable[[str], str],
+    header_index: typing.Optional[_ASGIHeaderIndex] = None,
 ) -> dict[str, list[str]]:
     """
     Returns custom HTTP request or response headers to be added into SERVER span as span attributes.
@@ -426,13 +633,13 @@ def collect_custom_headers_attributes(
      - https://github.com/open-telemetry/opentelemetry-specification/blob/main/specification/trace/semantic_conventions/http.md#http-request-and-response-headers
     """
     headers: DefaultDict[str, list[str]] = defaultdict(list)
-    raw_headers = scope_or_response_message.get("headers")
-    if raw_headers:
-        for key, value in raw_headers:
-            # Decode headers before processing.
-            headers[_decode_header_item(key)].append(
-                _decode_header_item(value)
-            )
+    for key, values in _get_header_index(
+        scope_or_response_message, header_index
+    ).items():
+        # Decode headers before processing.
+        headers[_decode_header_item(key)].extend(
+            _decode_header_item(value) for value in values
+        )
 
     return sanitize.sanitize_header_values(
         headers,
@@ -441,12 +648,74 @@ def collect_custom_headers_attributes(
     )
 
 
-def get_host_port_url_tuple(scope):
+# Bound on the header names remembered per capture list; names are client controlled
+_MAX_CAPTURED_HEADER_NAMES = 1024
+
+_REDACTED = "[REDACTED]"
+
+
+class _HeaderCapture:
+    """Custom header capture compiled once per middleware.
+
+    Equivalent to `collect_custom_headers_attributes`, but the capture
+    patterns are compiled once, and each header name is matched, normalized
+    and checked against the sanitize fields once and then remembered. Only
+    captured, unsanitized values are decoded.
+    """
+
+    __slots__ = ("_regex", "_sanitize", "_normalize_names", "_names")
+
+    def __init__(
+        self,
+        header_regexes: list[str],
+        sanitize: SanitizeValue,
+        normalize_names: Callable[[str], str],
+    ):
+        self._regex = re.compile("|".join(header_regexes), re.IGNORECASE)
+        self._sanitize = sanitize
+        self._normalize_names = normalize_names
+        # lower-case raw name -> (attribute key, redact) or None if not captured
+        self._names: dict[bytes, typing.Optional[Tuple[str, bool]]] = {}
+
+    def _lookup(self, name: bytes) -> typing.Optional[Tuple[str, bool]]:
+        try:
+            return self._names[name]
+        except KeyError:
+            pass
+        header_name = _decode_header_item(name)
+        entry = None
+        if self._regex.fullmatch(header_name):
+            entry = (
+                self._normalize_names(header_name),
+                self._sanitize.sanitize_header_value(header_name, "")
+                == _REDACTED,
+            )
+        if len(self._names) < _MAX_CAPTURED_HEADER_NAMES:
+            self._names[name] = entry
+        return entry
+
+    def collect(self, headers: _ASGIHeaderIndex) -> dict[str, list[str]]:
+        attributes = {}
+        for name, values in headers.items():
+            entry = self._lookup(name)
+            if entry is None:
+                continue
+            key, redact = entry
+            if redact:
+                attributes[key] = [_REDACTED] * len(values)
+            else:
+                attributes[key] = [
+                    _decode_header_item(value) for value in values
+                ]
+        return attributes
+
+
+def get_host_port_url_tuple(scope, *, headers=None):
     """Returns (host, port, full_url) tuple."""
     server = scope.get("server") or ["0.0.0.0", 80]
     port = server[1]
 
-    host_header = asgi_getter.get(scope, "host")
+    host_header = _get_header_index(scope, headers).get("host")
     if host_header:
         host_value = host_header[0]
         # Ensure host_value is a string, not bytes
@@ -506,10 +775,22 @@ def get_default_span_details(scope: dict) -> Tuple[str, dict]:
     Returns:
         a tuple of the span name, and any attributes to attach to the span.
     """
-    path = scope.get("path", "").strip()
-    method = sanitize_method(scope.get("method", "").strip())
+    return _default_span_details(
+        scope.get("path", ""), sanitize_method(scope.get("method", "").strip())
+    )
+
+
+def _default_span_details(
+    path: str, method: str, route: typing.Optional[str] = None
+) -> Tuple[str, dict]:
     if method == "_OTHER":
         method = "HTTP"
+    if route:
+        attributes = {SpanAttributes.HTTP_ROUTE: route}
+        if method:  # http
+            return f"{method} {route}", attributes
+        return route, attributes  # websocket
+    path = path.strip()
     if method and path:  # http
         return f"{method} {path}", {}
     if path:  # websocket
@@ -517,6 +798,109 @@ def get_default_span_details(scope: dict) -> Tuple[str, dict]:
     return method, {}  # http with no path
 
 
+class _RouteMatcher:
+    """Resolves the route template of a request from a Starlette-style
+    ``routes`` list before the application runs.
+
+    The route regexes are collected once per app. Matching follows the
+    router: only routes serving the scope type are considered, the first
+    route matching path and method wins, a route matching only the path is
+    used if nothing else matches, and mounts are searched recursively with
+    the mounted prefix prepended. A mount never names a request by itself.
+    """
+
+    __slots__ = ("_entries", "_mounts", "_routes", "routes")
+
+    def __init__(self, routes):
+        self.routes = routes
+        self._routes = tuple(routes)
+        entries = []
+        mounts = []
+        for route in self._routes:
+            path_regex = getattr(route, "path_regex", None)
+            if path_regex is None:
+                continue
+            children = getattr(route, "routes", None)
+            if children is not None:
+                matcher = _RouteMatcher(children)
+                mounts.append((route, matcher))
+                entries.append((path_regex, route.path, None, None, matcher))
+                continue
+            path_format = getattr(route, "path_format", None)
+            if path_format:
+                # HTTP routes have `methods`, even if None; websocket routes
+                # have no such attribute
+                if hasattr(route, "methods"):
+                    entries.append(
+                        (path_regex, path_format, "http", route.methods, None)
+                    )
+                else:
+                    entries.append(
+                        (path_regex, path_format, "websocket", None, None)
+                    )
+        self._entries = tuple(entries)
+        self._mounts = tuple(mounts)
+
+    def is_current(self, routes) -> bool:
+        """Whether `routes` and the routes of every mount are unchanged."""
+        if len(routes) != len(self._routes):
+            return False
+        if routes:
+            if routes is not self.routes:
+                return False
+            for cached, route in zip(self._routes, routes):
+                if cached is not route:
+                    return False
+        for mount, matcher in self._mounts:
+            if not matcher.is_current(mount.routes):
+                return False
+        return True
+
+    def match(
+        self, path: str, method: str, scope_type: str
+    ) -> typing.Optional[str]:
+        partial = None
+        for (
+            path_regex,
+            template,
+            route_type,
+            methods,
+            children,
+        ) in self._entries:
+            if route_type is not None and route_type != scope_type:
+                continue
+            match = path_regex.match(path)
+            if match is None:
+                continue
+            if children is not None:
+                remaining_path = "/" + match.groupdict().get("path", "")
+                child = children.match(remaining_path, method, scope_type)
+                return template + child if child else None
+            if not methods or method in methods:
+                return template
+            if partial is None:
+                partial = template
+        return partial
+
+
+_route_matchers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_route_matcher(app) -> typing.Optional[_RouteMatcher]:
+    """Returns the cached route matcher of `app`, or None if it has no routes."""
+    routes = getattr(app, "routes", None)
+    if not routes or not isinstance(routes, list):
+        return None
+    try:
+        matcher = _route_matchers.get(app)
+    except TypeError:
+        return _RouteMatcher(routes)
+    if matcher is None or not matcher.is_current(routes):
+        matcher = _RouteMatcher(routes)
+        _route_matchers[app] = matcher
+    return matcher
+
+
 def _collect_target_attribute(
     scope: typing.Dict[str, typing.Any],
 ) -> typing.Optional[str]:
@@ -565,6 +949,26 @@ class OpenTelemetryMiddleware:
         meter_provider: The optional meter provider to use. If omitted
             the current globally configured one is used.
         exclude_spans: Optionally exclude HTTP `send` and/or `receive` spans from the trace.
+        aggregate_spans: Optionally replace the `send` and/or `receive` spans with
+                      message counts, byte totals and first/last byte timestamps
+                      recorded as attributes of the server span.
+        message_event_interval: With `aggregate_spans`, also add a server span event
+                      for the first and then every Nth aggregated message.
+        slow_request_threshold: Optionally defer span detail until the request
+                      finishes. Sampled server spans start with the metric
+                      attributes only; the other request attributes, captured
+                      headers and per-message send/receive timing replace the
+                      `send` and `receive` spans and are set on the server span
+                      only when the request takes at least this many seconds
+                      or fails. A fast request still records its server span,
+                      so it costs more than an unsampled one; deferring the
+                      detail roughly halves the cost of an always-sampled
+                      request but does not bring it down to head sampling.
+        adaptive_sampling: Optional `LoadAdaptiveSampling` deciding, on top of
+                      the tracer provider's sampler, which requests are traced.
+        measure_overhead: Record the time spent in the middleware itself,
+                      excluding the wrapped app, in the
+                      `http.server.instrumentation.overhead` histogram by phase.
     """
 
     # pylint: disable=too-many-branches
@@ -584,6 +988,11 @@ class OpenTelemetryMiddleware:
         http_capture_headers_server_response: list[str] | None = None,
         http_capture_headers_sanitize_fields: list[str] | None = None,
         exclude_spans: list[typing.Literal["receive", "send"]] | None = None,
+        aggregate_spans: list[typing.Literal["receive", "send"]] | None = None,
+        message_event_interval: int | None = None,
+        slow_request_threshold: float | None = None,
+        adaptive_sampling: LoadAdaptiveSampling | None = None,
+        measure_overhead: bool = False,
     ):
         # initialize semantic conventions opt-in if needed
         _OpenTelemetrySemanticConventionStability._initialize()
@@ -653,9 +1062,45 @@ class OpenTelemetryMiddleware:
         self.active_requests_counter = create_http_server_active_requests(
             self.meter
         )
+        self.time_to_first_byte_histogram = self.meter.create_histogram(
+            name="http.server.response.time_to_first_byte",
+            description="Time from the start of an HTTP server request until the first response body byte is sent.",
+            unit="s",
+            explicit_bucket_boundaries_advisory=HTTP_DURATION_HISTOGRAM_BUCKETS_NEW,
+        )
+        self.time_to_last_byte_histogram = self.meter.create_histogram(
+            name="http.server.response.time_to_last_byte",
+            description="Time from the start of an HTTP server request until the response body is complete.",
+            unit="s",
+            explicit_bucket_boundaries_advisory=HTTP_DURATION_HISTOGRAM_BUCKETS_NEW,
+        )
+        self._overhead = (
+            _InstrumentationOverhead(
+                self.meter,
+                "http.server.instrumentation.overhead",
+                "Time spent in the ASGI instrumentation itself while serving a request.",
+            )
+            if measure_overhead
+            else None
+        )
+        self.adaptive_sampling = adaptive_sampling
+        if adaptive_sampling is not None:
+            self.meter.create_observable_gauge(
+                name="http.server.sampling.effective_rate",
+                callbacks=[
+                    lambda options: [
+                        Observation(adaptive_sampling.effective_rate())
+                    ]
+                ],
+                description="Share of HTTP server requests traced under the current load.",
+                unit="1",
+            )
         if isinstance(excluded_urls, str):
             excluded_urls = parse_excluded_urls(excluded_urls)
         self.excluded_urls = excluded_urls
+        self._excluded_paths = _ExcludedPathMatcher.from_exclude_list(
+            excluded_urls
+        )
         self.default_span_details = (
             default_span_details or get_default_span_details
         )
@@ -676,7 +1121,6 @@ class OpenTelemetryMiddleware:
         self.server_request_hook = failsafe(server_request_hook)
         self.client_request_hook = failsafe(client_request_hook)
         self.client_response_hook = failsafe(client_response_hook)
-        self.content_length_header = None
         self._sem_conv_opt_in_mode = sem_conv_opt_in_mode
 
         # Environment variables as constructor parameters
@@ -707,12 +1151,40 @@ class OpenTelemetryMiddleware:
             )
             or []
         )
+        self._request_header_capture = (
+            _HeaderCapture(
+                self.http_capture_headers_server_request,
+                self.http_capture_headers_sanitize_fields,
+                normalise_request_header_name,
+            )
+            if self.http_capture_headers_server_request
+            else None
+        )
+        self._response_header_capture = (
+            _HeaderCapture(
+                self.http_capture_headers_server_response,
+                self.http_capture_headers_sanitize_fields,
+                normalise_response_header_name,
+            )
+            if self.http_capture_headers_server_response
+            else None
+        )
         self.exclude_receive_span = (
             "receive" in exclude_spans if exclude_spans else False
         )
         self.exclude_send_span = (
             "send" in exclude_spans if exclude_spans else False
         )
+        self.aggregate_receive_span = (
+            "receive" in aggregate_spans if aggregate_spans else False
+        )
+        self.aggregate_send_span = (
+            "send" in aggregate_spans if aggregate_spans else False
+        )
+        self.message_event_interval = message_event_interval
+        self.slow_request_threshold = slow_request_threshold
+        self._request_detail_pool: list[_RequestDetail] = []
+        self._metric_attributes = _MetricAttributesCache(sem_conv_opt_in_mode)
 
     # pylint: disable=too-many-statements
     async def __call__(
@@ -730,72 +1202,119 @@ class OpenTelemetryMiddleware:
         """
         start = default_timer()
         if scope["type"] not in ("http", "websocket"):
+            if (
+                scope["type"] == "lifespan"
+                and self.adaptive_sampling is not None
+            ):
+                send = self._lifespan_send(send)
             return await self.app(scope, receive, send)
 
-        _, _, url = get_host_port_url_tuple(scope)
-        if self.excluded_urls and self.excluded_urls.url_disabled(url):
+        if self._excluded_paths and self._excluded_paths.excluded(
+            scope.get("path", "")
+        ):
             return await self.app(scope, receive, send)
 
-        span_name, additional_attributes = self.default_span_details(scope)
+        timer = (
+            _OverheadTimer(self._overhead)
+            if self._overhead is not None
+            else _NO_OVERHEAD_TIMER
+        )
+        facts = _RequestFacts(scope)
+        headers = facts.headers
+        if self.excluded_urls and self.excluded_urls.url_disabled(facts.url):
+            return await self.app(scope, receive, send)
+
+        route = None
+        if self.default_span_details is get_default_span_details:
+            route = self._resolve_route(scope, facts)
+            span_name, additional_attributes = _default_span_details(
+                facts.path or "", facts.sanitized_method, route
+            )
+        else:
+            span_name, additional_attributes = self.default_span_details(scope)
 
         attributes = collect_request_attributes(
-            scope, self._sem_conv_opt_in_mode
+            scope, self._sem_conv_opt_in_mode, request_facts=facts
         )
+        # Only the header index is used from here on; the derived URL and
+        # query are not kept alive while the app runs
+        del facts
         attributes.update(additional_attributes)
-        span, token = _start_internal_or_server_span(
-            tracer=self.tracer,
-            span_name=span_name,
-            start_time=None,
-            context_carrier=scope,
-            context_getter=asgi_getter,
-            attributes=attributes,
+        span_attributes = attributes
+        if self.slow_request_threshold is not None:
+            span_attributes = {
+                key: value
+                for key, value in attributes.items()
+                if key in _SLOW_REQUEST_START_ATTRIBUTES
+            }
+        timer.mark("attributes")
+        shed = None
+        shed_context = None
+        if (
+            self.adaptive_sampling is not None
+            and not self.adaptive_sampling.should_sample()
+        ):
+            shed = _start_shed_span(headers)
+        if shed is not None:
+            span, token, shed_context = shed
+            shed_start_time = time.time_ns()
+        else:
+            span, token = _start_internal_or_server_span(
+                tracer=self.tracer,
+                span_name=span_name,
+                start_time=None,
+                context_carrier=headers,
+                context_getter=asgi_getter,
+                attributes=span_attributes,
+            )
+        active_requests_count_attrs = (
+            self._metric_attributes.active_request_count_attrs(attributes)
         )
-        active_requests_count_attrs = _parse_active_request_count_attrs(
+
+        request = _ASGIRequestContext(
+            self,
+            scope,
+            receive,
+            send,
+            span,
+            span_name,
             attributes,
-            self._sem_conv_opt_in_mode,
+            start,
+            timer,
         )
-
+        timer.mark("span_start")
         if scope["type"] == "http":
             self.active_requests_counter.add(1, active_requests_count_attrs)
+            if self.adaptive_sampling is not None:
+                self.adaptive_sampling.request_started()
+            timer.mark("metrics")
         try:
             with trace.use_span(span, end_on_exit=False) as current_span:
-                if current_span.is_recording():
+                if request.detail is not None:
+                    request.detail.request_headers = headers
+                elif current_span.is_recording():
                     for key, value in attributes.items():
                         current_span.set_attribute(key, value)
 
-                    if current_span.kind == trace.SpanKind.SERVER:
+                    if (
+                        current_span.kind == trace.SpanKind.SERVER
+                        and self._request_header_capture
+                    ):
                         custom_attributes = (
-                            collect_custom_headers_attributes(
-                                scope,
-                                self.http_capture_headers_sanitize_fields,
-                                self.http_capture_headers_server_request,
-                                normalise_request_header_name,
-                            )
-                            if self.http_capture_headers_server_request
-                            else {}
+                            self._request_header_capture.collect(headers)
                         )
                         if len(custom_attributes) > 0:
                             current_span.set_attributes(custom_attributes)
+                timer.mark("attributes")
 
                 if callable(self.server_request_hook):
                     self.server_request_hook(current_span, scope)
 
-                otel_receive = self._get_otel_receive(
-                    span_name, scope, receive
-                )
-
-                otel_send = self._get_otel_send(
-                    current_span,
-                    span_name,
-                    scope,
-                    send,
-                    attributes,
-                )
-
-                await self.app(scope, otel_receive, otel_send)
+                await self.app(scope, request.receive, request.send)
         finally:
+            timer.skip()
             if scope["type"] == "http":
-                target = _collect_target_attribute(scope)
+                target = _collect_target_attribute(scope) or route
                 if target:
                     path, query = _parse_url_query(target)
                     _set_http_target(
@@ -806,13 +1325,8 @@ class OpenTelemetryMiddleware:
                         self._sem_conv_opt_in_mode,
                     )
                 duration_s = default_timer() - start
-                duration_attrs_old = _parse_duration_attrs(
-                    attributes, _StabilityMode.DEFAULT
-                )
-                if target:
-                    duration_attrs_old[SpanAttributes.HTTP_TARGET] = target
-                duration_attrs_new = _parse_duration_attrs(
-                    attributes, _StabilityMode.HTTP
+                duration_attrs_old, duration_attrs_new = (
+                    self._metric_attributes.duration_attrs(attributes, target)
                 )
                 if self.duration_histogram_old:
                     self.duration_histogram_old.record(
@@ -829,71 +1343,152 @@ class OpenTelemetryMiddleware:
                 self.active_requests_counter.add(
                     -1, active_requests_count_attrs
                 )
-                if self.content_length_header:
+                if self.adaptive_sampling is not None:
+                    self.adaptive_sampling.request_finished()
+                # Declared sizes win; streamed responses without a
+                # content-length report the body bytes actually sent
+                response_size = request.response_size or request.response_bytes
+                if response_size:
                     if self.server_response_size_histogram:
                         self.server_response_size_histogram.record(
-                            self.content_length_header,
+                            response_size,
                             duration_attrs_old,
                             context=context.get_current(),
                         )
                     if self.server_response_body_size_histogram:
                         self.server_response_body_size_histogram.record(
-                            self.content_length_header,
+                            response_size,
                             duration_attrs_new,
                             context=context.get_current(),
                         )
+                timing_attrs = (
+                    duration_attrs_new
+                    if _report_new(self._sem_conv_opt_in_mode)
+                    else duration_attrs_old
+                )
+                if request.first_byte_time is not None:
+                    self.time_to_first_byte_histogram.record(
+                        max(request.first_byte_time - start, 0),
+                        timing_attrs,
+                        context=context.get_current(),
+                    )
+                if request.last_byte_time is not None:
+                    self.time_to_last_byte_histogram.record(
+                        max(request.last_byte_time - start, 0),
+                        timing_attrs,
+                        context=context.get_current(),
+                    )
 
-                request_size = asgi_getter.get(scope, "content-length")
+                # The app may have replaced scope["headers"]; the index is rebuilt if so
+                request_size = _get_header_index(scope, headers).get(
+                    "content-length"
+                )
+                request_size_amount = None
                 if request_size:
                     try:
                         request_size_amount = int(request_size[0])
                     except ValueError:
                         pass
-                    else:
-                        if self.server_request_size_histogram:
-                            self.server_request_size_histogram.record(
-                                request_size_amount,
-                                duration_attrs_old,
-                                context=context.get_current(),
-                            )
-                        if self.server_request_body_size_histogram:
-                            self.server_request_body_size_histogram.record(
-                                request_size_amount,
-                                duration_attrs_new,
-                                context=context.get_current(),
-                            )
+                if request_size_amount is None and request.request_bytes:
+                    request_size_amount = request.request_bytes
+                if request_size_amount is not None:
+                    if self.server_request_size_histogram:
+                        self.server_request_size_histogram.record(
+                            request_size_amount,
+                            duration_attrs_old,
+                            context=context.get_current(),
+                        )
+                    if self.server_request_body_size_histogram:
+                        self.server_request_body_size_histogram.record(
+                            request_size_amount,
+                            duration_attrs_new,
+                            context=context.get_current(),
+                        )
+                timer.mark("metrics")
             if token:
                 context.detach(token)
             if span.is_recording():
-                span.end()
+                request.end_server_span()
+            elif shed_context is not None:
+                self._record_shed_error(
+                    request, shed_context, shed_start_time, sys.exc_info()[1]
+                )
+            timer.mark("span_end")
+            timer.record()
 
     # pylint: enable=too-many-branches
-    def _get_otel_receive(self, server_span_name, scope, receive):
-        if self.exclude_receive_span:
-            return receive
-
-        @wraps(receive)
-        async def otel_receive():
-            with self.tracer.start_as_current_span(
-                " ".join((server_span_name, scope["type"], "receive"))
-            ) as receive_span:
-                message = await receive()
-                if callable(self.client_request_hook):
-                    self.client_request_hook(receive_span, scope, message)
-                if receive_span.is_recording():
-                    if message["type"] == "websocket.receive":
-                        set_status_code(
-                            receive_span,
-                            200,
-                            None,
-                            self._sem_conv_opt_in_mode,
-                        )
-                    receive_span.set_attribute(
-                        "asgi.event.type", message["type"]
-                    )
-            return message
+    def _lifespan_send(self, send):
+        """Wraps the lifespan `send` to stop the adaptive sampling's loop lag
+        probe once the application has shut down."""
+
+        async def lifespan_send(message):
+            await send(message)
+            if message["type"] == "lifespan.shutdown.complete":
+                self.adaptive_sampling.shutdown()
+
+        return lifespan_send
+
+    def _resolve_route(self, scope, facts) -> typing.Optional[str]:
+        """Returns the route template of the request, prefixed with the root path."""
+        app = scope.get("app")
+        matcher = _get_route_matcher(app) if app is not None else None
+        if matcher is None:
+            matcher = _get_route_matcher(self.app)
+            if matcher is None:
+                return None
+        path = facts.path or ""
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        template = matcher.match(path, facts.method, scope["type"])
+        return f"{root_path}{template}" if template else None
+
+    def _record_shed_error(
+        self, request, parent_context, start_time, exception
+    ):
+        """Records the server span of a shed request that failed.
 
-        return otel_receive
+        The span joins the trace the app and downstream services saw: its
+        parent is the incoming parent, or for a root request the shed
+        stand-in span, marked as sampled so the sampler keeps it.
+        """
+        status_code = request.status_code
+        if exception is None and not (status_code and int(status_code) >= 500):
+            return
+        parent = trace.get_current_span(parent_context).get_span_context()
+        if not parent.is_valid:
+            parent = request.server_span.get_span_context()
+        sampled_parent = NonRecordingSpan(
+            SpanContext(
+                trace_id=parent.trace_id,
+                span_id=parent.span_id,
+                is_remote=parent.is_remote,
+                trace_flags=TraceFlags(TraceFlags.SAMPLED),
+                trace_state=parent.trace_state,
+            )
+        )
+        span = self.tracer.start_span(
+            request.server_span_name,
+            context=set_span_in_context(sampled_parent, parent_context),
+            kind=trace.SpanKind.SERVER,
+            start_time=start_time,
+            attributes=request.attributes,
+        )
+        if span.is_recording():
+            span.set_attribute("asgi.sampling.shed", True)
+            if status_code:
+                set_status_code(
+                    span, status_code, None, self._sem_conv_opt_in_mode
+                )
+            if exception is not None:
+                span.record_exception(exception)
+                span.set_status(
+                    Status(
+                        StatusCode.ERROR,
+                        f"{type(exception).__name__}: {exception}",
+                    )
+                )
+        span.end()
 
     def _set_send_span(
         self,
@@ -930,19 +1525,13 @@ class OpenTelemetryMiddleware:
     ):
         """Set server span attributes and status code."""
         if (
-            server_span.is_recording()
-            and server_span.kind == trace.SpanKind.SERVER
+            self._response_header_capture
             and "headers" in message
+            and server_span.is_recording()
+            and server_span.kind == trace.SpanKind.SERVER
         ):
-            custom_response_attributes = (
-                collect_custom_headers_attributes(
-                    message,
-                    self.http_capture_headers_sanitize_fields,
-                    self.http_capture_headers_server_response,
-                    normalise_response_header_name,
-                )
-                if self.http_capture_headers_server_response
-                else {}
+            custom_response_attributes = self._response_header_capture.collect(
+                _ASGIHeaderIndex(message["headers"])
             )
             if len(custom_response_attributes) > 0:
                 server_span.set_attributes(custom_response_attributes)
@@ -955,72 +1544,632 @@ class OpenTelemetryMiddleware:
                 self._sem_conv_opt_in_mode,
             )
 
-    def _get_otel_send(
+
+class _MessageStats:
+    """Running totals of the ASGI messages received or sent for one request."""
+
+    __slots__ = (
+        "kind",
+        "messages",
+        "bytes",
+        "first_byte_time",
+        "last_byte_time",
+    )
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.reset()
+
+    def reset(self):
+        self.messages = 0
+        self.bytes = 0
+        self.first_byte_time = None
+        self.last_byte_time = None
+
+    def record(self, message: dict[str, Any]) -> int:
+        """Counts `message` and returns its position in the stream."""
+        self.messages += 1
+        payload = (
+            message.get("body") or message.get("bytes") or message.get("text")
+        )
+        if payload:
+            # ASCII text is as long as its UTF-8 encoding, so only other
+            # text is encoded to be measured
+            if isinstance(payload, str) and not payload.isascii():
+                payload = payload.encode("utf-8")
+            now = time.time_ns()
+            if self.first_byte_time is None:
+                self.first_byte_time = now
+            self.last_byte_time = now
+            self.bytes += len(payload)
+        return self.messages
+
+    def attributes(self) -> dict[str, int]:
+        prefix = f"asgi.{self.kind}"
+        attributes = {
+            f"{prefix}.messages": self.messages,
+            f"{prefix}.bytes": self.bytes,
+        }
+        if self.first_byte_time is not None:
+            attributes[f"{prefix}.first_byte_time"] = self.first_byte_time
+            attributes[f"{prefix}.last_byte_time"] = self.last_byte_time
+        return attributes
+
+
+def _start_shed_span(context_carrier):
+    """Starts the stand-in for a server span shed by adaptive sampling.
+
+    Like `_start_internal_or_server_span`, the incoming context is attached
+    when there is no current span. The returned span is not recording, but
+    its context is valid and unsampled, so the app's spans and downstream
+    services are not sampled either.
+
+    Only roots and requests with an unsampled parent are shed: if the parent
+    is sampled, its decision is kept and None is returned without attaching
+    anything.
+    """
+    token = None
+    attach = trace.get_current_span() is trace.INVALID_SPAN
+    if attach:
+        parent_context = extract(context_carrier, getter=asgi_getter)
+    else:
+        parent_context = context.get_current()
+    parent = trace.get_current_span(parent_context).get_span_context()
+    if parent.is_valid and parent.trace_flags.sampled:
+        return None
+    if attach:
+        token = context.attach(parent_context)
+    span = NonRecordingSpan(
+        SpanContext(
+            trace_id=(
+                parent.trace_id if parent.is_valid else random.getrandbits(128)
+            ),
+            span_id=random.getrandbits(64),
+            is_remote=False,
+            trace_flags=TraceFlags(TraceFlags.DEFAULT),
+            trace_state=parent.trace_state,
+        )
+    )
+    return span, token, parent_context
+
+
+# Attributes a server span starts with under `slow_request_threshold`, so
+# samplers still see the method, scheme, route and server address
+_SLOW_REQUEST_START_ATTRIBUTES = frozenset(
+    (
+        *_server_duration_attrs_old,
+        *_server_duration_attrs_new,
+        SpanAttributes.HTTP_ROUTE,
+    )
+)
+# Bound on the message events kept per request and on the idle buffers kept
+# per middleware
+_MAX_REQUEST_DETAIL_EVENTS = 128
+_MAX_POOLED_REQUEST_DETAILS = 256
+
+
+class _RequestDetail:
+    """Span detail of one request, held back until the request finishes.
+
+    Only references and counters are recorded while the request runs; the
+    header values are decoded and the span attributes and events are set
+    by `materialize`, which is skipped for fast, successful requests.
+    Instances are reused through the middleware's pool.
+    """
+
+    __slots__ = (
+        "attributes",
+        "request_headers",
+        "response_headers",
+        "receive_stats",
+        "send_stats",
+        "events",
+    )
+
+    def __init__(self):
+        self.receive_stats = _MessageStats("receive")
+        self.send_stats = _MessageStats("send")
+        self.events = []
+        self.clear()
+
+    def clear(self):
+        self.attributes = None
+        self.request_headers = None
+        self.response_headers = None
+        self.receive_stats.reset()
+        self.send_stats.reset()
+        self.events.clear()
+
+    def record(self, stats: _MessageStats, message: dict[str, Any]):
+        stats.record(message)
+        if len(self.events) < _MAX_REQUEST_DETAIL_EVENTS:
+            self.events.append(
+                (time.time_ns(), stats.kind, message["type"], stats.bytes)
+            )
+
+    def materialize(
+        self, middleware: OpenTelemetryMiddleware, server_span, reason: str
+    ):
+        """Sets everything recorded for the request on `server_span`."""
+        server_span.set_attributes(self.attributes)
+        if server_span.kind == trace.SpanKind.SERVER:
+            capture = middleware._request_header_capture
+            if capture and self.request_headers is not None:
+                server_span.set_attributes(
+                    capture.collect(self.request_headers)
+                )
+            capture = middleware._response_header_capture
+            if capture and self.response_headers is not None:
+                server_span.set_attributes(
+                    capture.collect(_ASGIHeaderIndex(self.response_headers))
+                )
+        for stats in (self.receive_stats, self.send_stats):
+            if stats.messages:
+                server_span.set_attributes(stats.attributes())
+        for timestamp, kind, event_type, size in self.events:
+            server_span.add_event(
+                f"asgi.{kind}",
+                {"asgi.event.type": event_type, "asgi.message.bytes": size},
+                timestamp=timestamp,
+            )
+        server_span.set_attribute("asgi.detail.reason", reason)
+
+
+class _ASGIRequestContext:
+    """State of one request passing through `OpenTelemetryMiddleware`.
+
+    The wrapped ``receive`` and ``send`` callables are bound methods of this
+    object, so concurrent requests never share the response size or trailer
+    state, and no closures are created per request.
+
+    When the server span is not sampled, its ``receive`` and ``send`` child
+    spans would be dropped as well, so they are not started unless a client
+    hook needs them. The metrics still see every status code and size.
+
+    With ``aggregate_spans``, messages are counted into `_MessageStats`
+    instead, and the totals are set on the server span just before it ends.
+
+    With ``slow_request_threshold``, a sampled request records into a pooled
+    `_RequestDetail` instead of starting child spans, and the detail reaches
+    the server span only if the request turns out slow or failing.
+
+    HTTP body bytes are always counted as they pass, by length only, so the
+    size and time-to-first/last-byte metrics work for streamed bodies that
+    have no content-length.
+    """
+
+    __slots__ = (
+        "middleware",
+        "scope",
+        "app_receive",
+        "app_send",
+        "server_span",
+        "server_span_name",
+        "attributes",
+        "start",
+        "timer",
+        "detail",
+        "status_code",
+        "response_size",
+        "expecting_trailers",
+        "receive_spans",
+        "send_spans",
+        "receive_stats",
+        "send_stats",
+        "request_bytes",
+        "response_bytes",
+        "first_byte_time",
+        "last_byte_time",
+    )
+
+    def __init__(
         self,
-        server_span,
-        server_span_name,
+        middleware: OpenTelemetryMiddleware,
         scope,
+        receive,
         send,
-        duration_attrs,
+        server_span,
+        server_span_name,
+        attributes,
+        start,
+        timer,
     ):
-        expecting_trailers = False
+        self.middleware = middleware
+        self.scope = scope
+        self.app_receive = receive
+        self.app_send = send
+        self.server_span = server_span
+        self.server_span_name = server_span_name
+        self.attributes = attributes
+        self.start = start
+        self.timer = timer
+        self.status_code = None
+        self.response_size = None
+        self.expecting_trailers = False
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.first_byte_time = None
+        self.last_byte_time = None
+        recording = server_span.is_recording()
+        self.receive_stats = None
+        self.send_stats = None
+        self.receive_spans = False
+        self.send_spans = False
+        self.detail = None
+        if recording and middleware.slow_request_threshold is not None:
+            try:
+                self.detail = middleware._request_detail_pool.pop()
+            except IndexError:
+                self.detail = _RequestDetail()
+            self.detail.attributes = attributes
+            return
+        if not middleware.exclude_receive_span:
+            if middleware.aggregate_receive_span:
+                if recording:
+                    self.receive_stats = _MessageStats("receive")
+            else:
+                self.receive_spans = (
+                    recording or middleware.client_request_hook is not None
+                )
+        if not middleware.exclude_send_span:
+            if middleware.aggregate_send_span:
+                if recording:
+                    self.send_stats = _MessageStats("send")
+            else:
+                self.send_spans = (
+                    recording or middleware.client_response_hook is not None
+                )
 
-        @wraps(send)
-        async def otel_send(message: dict[str, Any]):
-            nonlocal expecting_trailers
+    def _count_message(self, stats: _MessageStats, message: dict[str, Any]):
+        position = stats.record(message)
+        interval = self.middleware.message_event_interval
+        if interval and (position - 1) % interval == 0:
+            self.server_span.add_event(
+                f"asgi.{stats.kind}",
+                {
+                    "asgi.event.type": message["type"],
+                    "asgi.message.position": position,
+                    "asgi.message.bytes": stats.bytes,
+                },
+            )
 
-            status_code = None
+    def end_server_span(self):
+        """Sets the aggregated message totals, and the deferred detail of a
+        slow or failed request, on the server span and ends it."""
+        server_span = self.server_span
+        for stats in (self.receive_stats, self.send_stats):
+            if stats is not None:
+                server_span.set_attributes(stats.attributes())
+        detail = self.detail
+        if detail is not None:
+            self.detail = None
+            reason = None
+            if (self.status_code and int(self.status_code) >= 500) or (
+                getattr(server_span, "status", None) is not None
+                and server_span.status.status_code == trace.StatusCode.ERROR
+            ):
+                reason = "error"
+            elif (
+                default_timer() - self.start
+                >= self.middleware.slow_request_threshold
+            ):
+                reason = "slow"
+            if reason is not None:
+                detail.materialize(self.middleware, server_span, reason)
+            detail.clear()
+            pool = self.middleware._request_detail_pool
+            if len(pool) < _MAX_POOLED_REQUEST_DETAILS:
+                pool.append(detail)
+        server_span.end()
+        # Messages received after the response, such as http.disconnect,
+        # must not add events to the ended span
+        self.receive_stats = None
+        self.send_stats = None
+
+    async def receive(self):
+        timer = self.timer
+        timer.skip()
+        if self.receive_spans:
+            message = await self._receive_with_span()
+        else:
+            message = await self.app_receive()
+            timer.skip()
+            if self.receive_stats is not None:
+                self._count_message(self.receive_stats, message)
+            elif self.detail is not None:
+                self.detail.record(self.detail.receive_stats, message)
+        if message["type"] == "http.request":
+            self.request_bytes += len(message.get("body", b""))
+        timer.mark("receive")
+        return message
+
+    async def _receive_with_span(self):
+        middleware = self.middleware
+        scope = self.scope
+        timer = self.timer
+        with middleware.tracer.start_as_current_span(
+            " ".join((self.server_span_name, scope["type"], "receive"))
+        ) as receive_span:
+            timer.mark("receive")
+            message = await self.app_receive()
+            timer.skip()
+            if callable(middleware.client_request_hook):
+                middleware.client_request_hook(receive_span, scope, message)
+                timer.skip()
+            if receive_span.is_recording():
+                if message["type"] == "websocket.receive":
+                    set_status_code(
+                        receive_span,
+                        200,
+                        None,
+                        middleware._sem_conv_opt_in_mode,
+                    )
+                receive_span.set_attribute("asgi.event.type", message["type"])
+        return message
+
+    async def send(self, message: dict[str, Any]):
+        middleware = self.middleware
+        server_span = self.server_span
+        timer = self.timer
+        timer.skip()
+
+        status_code = None
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "websocket.send":
+            status_code = 200
+        if status_code:
+            self.status_code = status_code
+        elif message["type"] == "http.response.body":
+            size = len(message.get("body", b""))
+            if size:
+                if self.first_byte_time is None:
+                    self.first_byte_time = default_timer()
+                self.response_bytes += size
+            if not message.get("more_body", False):
+                self.last_byte_time = default_timer()
+
+        detail = self.detail
+        if detail is not None:
             if message["type"] == "http.response.start":
-                status_code = message["status"]
-            elif message["type"] == "websocket.send":
-                status_code = 200
-
-            if not self.exclude_send_span:
-                expecting_trailers = self._set_send_span(
-                    server_span_name,
-                    scope,
-                    send,
+                self.expecting_trailers = message.get("trailers", False)
+                detail.response_headers = message.get("headers")
+            detail.record(detail.send_stats, message)
+            if status_code:
+                set_status_code(
+                    server_span,
+                    status_code,
+                    self.attributes,
+                    middleware._sem_conv_opt_in_mode,
+                )
+        else:
+            if self.send_stats is not None:
+                if message["type"] == "http.response.start":
+                    self.expecting_trailers = message.get("trailers", False)
+                self._count_message(self.send_stats, message)
+            elif self.send_spans:
+                self.expecting_trailers = middleware._set_send_span(
+                    self.server_span_name,
+                    self.scope,
+                    self.app_send,
                     message,
                     status_code,
-                    expecting_trailers,
+                    self.expecting_trailers,
                 )
 
-            self._set_server_span(
-                server_span, message, status_code, duration_attrs
+            middleware._set_server_span(
+                server_span, message, status_code, self.attributes
             )
+        timer.mark("attributes")
+
+        propagator = get_global_response_propagator()
+        if propagator:
+            propagator.inject(
+                message,
+                context=set_span_in_context(
+                    server_span, trace.context_api.Context()
+                ),
+                setter=asgi_setter,
+            )
+            timer.mark("propagation")
 
-            propagator = get_global_response_propagator()
-            if propagator:
-                propagator.inject(
-                    message,
-                    context=set_span_in_context(
-                        server_span, trace.context_api.Context()
-                    ),
-                    setter=asgi_setter,
-                )
+        content_length = asgi_getter.get(message, "content-length")
+        if content_length:
+            try:
+                self.response_size = int(content_length[0])
+            except ValueError:
+                pass
+        timer.mark("metrics")
 
-            content_length = asgi_getter.get(message, "content-length")
-            if content_length:
-                try:
-                    self.content_length_header = int(content_length[0])
-                except ValueError:
-                    pass
+        await self.app_send(message)
 
-            await send(message)
+        expecting_trailers = self.expecting_trailers
+        # pylint: disable=too-many-boolean-expressions
+        if (
+            not expecting_trailers
+            and message["type"] == "http.response.body"
+            and not message.get("more_body", False)
+        ) or (
+            expecting_trailers
+            and message["type"] == "http.response.trailers"
+            and not message.get("more_trailers", False)
+        ):
+            timer.skip()
+            self.end_server_span()
+            timer.mark("span_end")
+
+
+# Upper bounds, in seconds, of the instrumentation overhead histogram buckets
+_OVERHEAD_BUCKETS = (
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+)
+_OVERHEAD_PHASES = (
+    "attributes",
+    "span_start",
+    "receive",
+    "propagation",
+    "metrics",
+    "span_end",
+)
 
-            # pylint: disable=too-many-boolean-expressions
-            if (
-                not expecting_trailers
-                and message["type"] == "http.response.body"
-                and not message.get("more_body", False)
-            ) or (
-                expecting_trailers
-                and message["type"] == "http.response.trailers"
-                and not message.get("more_trailers", False)
-            ):
-                server_span.end()
 
-        return otel_send
+class _InstrumentationOverhead:
+    """Histogram of the time spent in the instrumentation itself, by phase."""
+
+    __slots__ = ("_histogram", "_phase_attributes")
+
+    def __init__(self, meter, name: str, description: str):
+        self._histogram = meter.create_histogram(
+            name=name,
+            unit="s",
+            description=description,
+            explicit_bucket_boundaries_advisory=_OVERHEAD_BUCKETS,
+        )
+        self._phase_attributes = {
+            phase: {"otel.instrumentation.phase": phase}
+            for phase in _OVERHEAD_PHASES
+        }
+
+    def record(self, totals: dict[str, float]):
+        for phase, seconds in totals.items():
+            self._histogram.record(seconds, self._phase_attributes[phase])
+
+
+class _OverheadTimer:
+    """Splits the instrumentation's own time for one request into phases.
+
+    `mark` charges the time since the previous `mark` or `skip` to a phase,
+    and `skip` discards it, for time spent in the app or in hooks.
+    """
+
+    __slots__ = ("_overhead", "_last", "totals")
+
+    def __init__(self, overhead: _InstrumentationOverhead):
+        self._overhead = overhead
+        self.totals = {}
+        self._last = default_timer()
+
+    def mark(self, phase: str):
+        now = default_timer()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def skip(self):
+        self._last = default_timer()
+
+    def record(self):
+        self._overhead.record(self.totals)
+
+
+class _NoOverheadTimer:
+    """Stands in for `_OverheadTimer` when overhead is not measured."""
+
+    __slots__ = ()
+
+    def mark(self, phase: str):
+        pass
+
+    def skip(self):
+        pass
+
+    def record(self):
+        pass
+
+
+_NO_OVERHEAD_TIMER = _NoOverheadTimer()
+
+
+# Bound on the attribute sets interned per middleware. Old semantic
+# conventions include the Host header, so the key space is client controlled.
+_MAX_METRIC_ATTRIBUTE_SETS = 2048
+
+
+class _MetricAttributesCache:
+    """Interned metric attribute dicts, keyed by the request attribute values
+    they are filtered from.
+
+    Steady-state traffic repeats the same method, route, status code, scheme
+    and protocol version, so after warm-up each request costs one tuple and
+    one dictionary lookup per metric attribute set. Cached dicts are shared
+    between requests and must not be modified.
+    """
+
+    __slots__ = (
+        "_sem_conv_opt_in_mode",
+        "_duration_keys",
+        "_active_request_keys",
+        "_duration",
+        "_active_requests",
+    )
+
+    def __init__(self, sem_conv_opt_in_mode=_StabilityMode.DEFAULT):
+        self._sem_conv_opt_in_mode = sem_conv_opt_in_mode
+        self._duration_keys = tuple(
+            dict.fromkeys(
+                _server_duration_attrs_old + _server_duration_attrs_new
+            )
+        )
+        self._active_request_keys = tuple(
+            dict.fromkeys(
+                _server_active_requests_count_attrs_old
+                + _server_active_requests_count_attrs_new
+            )
+        )
+        self._duration = {}
+        self._active_requests = {}
+
+    def duration_attrs(self, attributes, target=None):
+        """Returns the old and new semantic convention duration attributes."""
+        key = (target, *map(attributes.get, self._duration_keys))
+        try:
+            return self._duration[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable attribute value
+            return self._build_duration_attrs(attributes, target)
+        entry = self._build_duration_attrs(attributes, target)
+        if len(self._duration) < _MAX_METRIC_ATTRIBUTE_SETS:
+            self._duration[key] = entry
+        return entry
+
+    def active_request_count_attrs(self, attributes):
+        key = tuple(map(attributes.get, self._active_request_keys))
+        try:
+            return self._active_requests[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return _parse_active_request_count_attrs(
+                attributes, self._sem_conv_opt_in_mode
+            )
+        entry = _parse_active_request_count_attrs(
+            attributes, self._sem_conv_opt_in_mode
+        )
+        if len(self._active_requests) < _MAX_METRIC_ATTRIBUTE_SETS:
+            self._active_requests[key] = entry
+        return entry
+
+    @staticmethod
+    def _build_duration_attrs(attributes, target):
+        duration_attrs_old = _parse_duration_attrs(
+            attributes, _StabilityMode.DEFAULT
+        )
+        if target:
+            duration_attrs_old[SpanAttributes.HTTP_TARGET] = target
+        duration_attrs_new = _parse_duration_attrs(
+            attributes, _StabilityMode.HTTP
+        )
+        return duration_attrs_old, duration_attrs_new
 
 
 def _parse_duration_attrs(
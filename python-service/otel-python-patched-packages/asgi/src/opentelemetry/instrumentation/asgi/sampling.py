@@ -0,0 +1,133 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load-adaptive head sampling for `OpenTelemetryMiddleware`."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+
+class LoadAdaptiveSampling:
+    """Head sampling rate that falls as the service gets saturated.
+
+    Load is measured as the larger of two ratios: requests in flight in the
+    middlewares using this object over ``max_active_requests``, and the
+    event loop lag over ``max_loop_lag``. Up to a load of 1 requests are
+    sampled at ``rate``; above it the rate is divided by the load, but never
+    drops below ``min_rate``.
+
+    Args:
+        rate: The sampling rate of an idle service.
+        min_rate: The lowest rate applied under load.
+        max_active_requests: The number of in-flight requests at which
+            sampling starts to back off.
+        max_loop_lag: The event loop lag, in seconds, at which sampling
+            starts to back off.
+        lag_probe_interval: How often, in seconds, the event loop lag is
+            measured.
+
+    The lag is measured on the loop of the latest request until `shutdown`
+    is called, which the middleware does when the application's lifespan
+    shuts down.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.01,
+        max_active_requests: int = 100,
+        max_loop_lag: float = 0.1,
+        lag_probe_interval: float = 0.5,
+    ):
+        if not 0.0 <= min_rate <= rate <= 1.0:
+            raise ValueError(
+                "Sampling rates must satisfy 0 <= min_rate <= rate <= 1"
+            )
+        if max_active_requests <= 0:
+            raise ValueError("max_active_requests must be greater than 0")
+        if max_loop_lag <= 0:
+            raise ValueError("max_loop_lag must be greater than 0")
+        if lag_probe_interval <= 0:
+            raise ValueError("lag_probe_interval must be greater than 0")
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_active_requests = max_active_requests
+        self.max_loop_lag = max_loop_lag
+        self.lag_probe_interval = lag_probe_interval
+        self.active_requests = 0
+        self.loop_lag = 0.0
+        self._loop = None
+        self._probe_handle = None
+
+    def effective_rate(self) -> float:
+        """Returns the sampling rate for the current load."""
+        load = max(
+            self.active_requests / self.max_active_requests,
+            self.loop_lag / self.max_loop_lag,
+        )
+        if load <= 1.0:
+            return self.rate
+        return max(self.rate / load, self.min_rate)
+
+    def should_sample(self) -> bool:
+        """Decides whether the request being started is traced."""
+        self._watch_loop()
+        rate = self.effective_rate()
+        return rate >= 1.0 or random.random() < rate
+
+    def request_started(self):
+        self.active_requests += 1
+
+    def request_finished(self):
+        self.active_requests -= 1
+
+    def shutdown(self):
+        """Stops measuring the event loop lag.
+
+        Must be called on the loop being measured. A later request restarts
+        the measurement on its own loop.
+        """
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+        self._loop = None
+        self.loop_lag = 0.0
+
+    def _watch_loop(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if loop is not self._loop:
+            self._loop = loop
+            self.loop_lag = 0.0
+            self._schedule_probe(loop)
+
+    def _schedule_probe(self, loop):
+        self._probe_handle = loop.call_later(
+            self.lag_probe_interval,
+            self._probe,
+            loop,
+            loop.time() + self.lag_probe_interval,
+        )
+
+    def _probe(self, loop, scheduled_time: float):
+        # A probe chain belongs to the loop it was started on; a replaced
+        # loop's chain stops here
+        if loop is not self._loop:
+            return
+        self.loop_lag = max(loop.time() - scheduled_time, 0.0)
+        self._schedule_probe(loop)
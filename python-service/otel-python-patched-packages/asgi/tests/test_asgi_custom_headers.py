@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import os
+from unittest import TestCase, mock
 
 import opentelemetry.instrumentation.asgi as otel_asgi
 from opentelemetry.test.asgitestutil import AsyncAsgiTestBase
@@ -22,6 +23,8 @@ from opentelemetry.util.http import (
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SANITIZE_FIELDS,
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_REQUEST,
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_RESPONSE,
+    SanitizeValue,
+    normalise_request_header_name,
 )
 
 from .test_asgi_middleware import simple_asgi
@@ -478,3 +481,63 @@ class TestCustomHeadersConstructor(TestCustomHeaders):
             ","
         ),
     }
+
+
+class TestHeaderCapture(TestCase):
+    def setUp(self):
+        self.header_regexes = SERVER_REQUEST_TEST_VALUE.split(",")
+        self.sanitize = SanitizeValue(SANITIZE_FIELDS_TEST_VALUE.split(","))
+        self.message = {
+            "headers": [
+                (b"Custom-Test-Header-1", b"test-header-value-1"),
+                (b"custom-test-header-1", b"test-header-value-2"),
+                (b"regex-test-header-1", b"regex-test-value-1"),
+                (b"My-Secret-Header", b"my-secret-value"),
+                (b"non-utf8-header", b"Moto Z\xb2"),
+                (b"not-captured", b"value"),
+            ]
+        }
+
+    def test_matches_collect_custom_headers_attributes(self):
+        capture = otel_asgi._HeaderCapture(
+            self.header_regexes, self.sanitize, normalise_request_header_name
+        )
+        expected = {
+            "http.request.header.custom_test_header_1": [
+                "test-header-value-1",
+                "test-header-value-2",
+            ],
+            "http.request.header.regex_test_header_1": ["regex-test-value-1"],
+            "http.request.header.my_secret_header": ["[REDACTED]"],
+            "http.request.header.non_utf8_header": ["Moto Z²"],
+        }
+        for _ in range(2):
+            self.assertEqual(
+                capture.collect(
+                    otel_asgi._ASGIHeaderIndex(self.message["headers"])
+                ),
+                expected,
+            )
+        single_case_headers = {"headers": self.message["headers"][1:]}
+        self.assertEqual(
+            capture.collect(
+                otel_asgi._ASGIHeaderIndex(single_case_headers["headers"])
+            ),
+            otel_asgi.collect_custom_headers_attributes(
+                single_case_headers,
+                self.sanitize,
+                self.header_regexes,
+                normalise_request_header_name,
+            ),
+        )
+
+    def test_header_names_bounded(self):
+        capture = otel_asgi._HeaderCapture(
+            self.header_regexes, self.sanitize, normalise_request_header_name
+        )
+        with mock.patch.object(otel_asgi, "_MAX_CAPTURED_HEADER_NAMES", 2):
+            attributes = capture.collect(
+                otel_asgi._ASGIHeaderIndex(self.message["headers"])
+            )
+        self.assertEqual(len(capture._names), 2)
+        self.assertEqual(len(attributes), 4)
@@ -0,0 +1,97 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from opentelemetry.instrumentation.asgi.sampling import LoadAdaptiveSampling
+
+
+class TestLoadAdaptiveSampling(TestCase):
+    def test_rate_below_load_limits(self):
+        sampling = LoadAdaptiveSampling(rate=0.5, max_active_requests=10)
+        for _ in range(10):
+            sampling.request_started()
+        self.assertEqual(sampling.effective_rate(), 0.5)
+
+    def test_rate_backs_off_with_active_requests(self):
+        sampling = LoadAdaptiveSampling(max_active_requests=10)
+        for _ in range(40):
+            sampling.request_started()
+        self.assertEqual(sampling.effective_rate(), 0.25)
+        for _ in range(40):
+            sampling.request_finished()
+        self.assertEqual(sampling.effective_rate(), 1.0)
+
+    def test_rate_backs_off_with_loop_lag(self):
+        sampling = LoadAdaptiveSampling(max_loop_lag=0.1, min_rate=0.05)
+        sampling.loop_lag = 0.5
+        self.assertAlmostEqual(sampling.effective_rate(), 0.2)
+        sampling.loop_lag = 100.0
+        self.assertEqual(sampling.effective_rate(), 0.05)
+
+    def test_invalid_rates(self):
+        with self.assertRaises(ValueError):
+            LoadAdaptiveSampling(rate=0.1, min_rate=0.5)
+        with self.assertRaises(ValueError):
+            LoadAdaptiveSampling(rate=1.5)
+
+    def test_invalid_load_limits(self):
+        for kwargs in (
+            {"max_active_requests": 0},
+            {"max_loop_lag": 0.0},
+            {"max_loop_lag": -1.0},
+            {"lag_probe_interval": 0.0},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                LoadAdaptiveSampling(**kwargs)
+
+    def test_should_sample(self):
+        self.assertTrue(LoadAdaptiveSampling().should_sample())
+        self.assertFalse(
+            LoadAdaptiveSampling(rate=0.0, min_rate=0.0).should_sample()
+        )
+
+
+class TestLoopLagProbe(IsolatedAsyncioTestCase):
+    async def test_blocked_loop_raises_lag(self):
+        sampling = LoadAdaptiveSampling(
+            max_loop_lag=0.01, lag_probe_interval=0.01
+        )
+        sampling.should_sample()
+        await asyncio.sleep(0.001)
+        # Block the loop past the next probe, then let the late probe run
+        loop = asyncio.get_running_loop()
+        blocked_until = loop.time() + 0.05
+        while loop.time() < blocked_until:
+            pass
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertGreater(sampling.loop_lag, 0.02)
+        self.assertLess(sampling.effective_rate(), 1.0)
+
+    async def test_shutdown_stops_probe(self):
+        sampling = LoadAdaptiveSampling(lag_probe_interval=0.01)
+        sampling.should_sample()
+        probe = sampling._probe_handle
+        sampling.loop_lag = 0.5
+        sampling.shutdown()
+        self.assertTrue(probe.cancelled())
+        self.assertEqual(sampling.loop_lag, 0.0)
+        await asyncio.sleep(0.03)
+        self.assertIsNone(sampling._probe_handle)
+        # The next request starts measuring again
+        sampling.should_sample()
+        self.assertIsNotNone(sampling._probe_handle)
+        sampling.shutdown()
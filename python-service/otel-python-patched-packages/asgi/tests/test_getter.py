@@ -14,7 +14,11 @@
 
 from unittest import TestCase
 
-from opentelemetry.instrumentation.asgi import ASGIGetter
+from opentelemetry.instrumentation.asgi import (
+    ASGIGetter,
+    _ASGIHeaderIndex,
+    _get_header_index,
+)
 
 
 class TestASGIGetter(TestCase):
@@ -79,3 +83,42 @@ class TestASGIGetter(TestCase):
             expected_val,
             "Should be equal",
         )
+
+    def test_non_utf8_header_name(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"Moto-Z\xb2-Key", b"val")]}
+        self.assertEqual(getter.get(carrier, "moto-z²-key"), ["val"])
+        self.assertEqual(
+            _ASGIHeaderIndex(carrier["headers"]).get("MOTO-Z²-KEY"), ["val"]
+        )
+
+
+class TestASGIHeaderIndex(TestCase):
+    def test_get_from_index(self):
+        getter = ASGIGetter()
+        index = _ASGIHeaderIndex(
+            [(b"Test-Key", b"val1"), (b"test-key", b"val2")]
+        )
+        self.assertEqual(getter.get(index, "TEST-KEY"), ["val1", "val2"])
+        self.assertIsNone(getter.get(index, "missing"))
+
+    def test_keys_from_index(self):
+        getter = ASGIGetter()
+        index = _ASGIHeaderIndex([(b"Test-Key", b"val"), (b"other", b"v")])
+        self.assertEqual(getter.keys(index), ["test-key", "other"])
+
+    def test_index_empty_headers(self):
+        index = _ASGIHeaderIndex(None)
+        self.assertIsNone(index.get("test"))
+        self.assertEqual(index.keys(), [])
+
+    def test_index_non_utf8_headers(self):
+        index = _ASGIHeaderIndex([(b"test-key", b"Moto Z\xb2")])
+        self.assertEqual(index.get("test-key"), ["Moto Z²"])
+
+    def test_index_reused_only_for_same_headers(self):
+        scope = {"headers": [(b"host", b"a")]}
+        index = _ASGIHeaderIndex(scope["headers"])
+        self.assertIs(_get_header_index(scope, index), index)
+        scope["headers"] = [(b"host", b"b")]
+        self.assertEqual(_get_header_index(scope, index).get("host"), ["b"])
@@ -0,0 +1,54 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import tracemalloc
+
+import httpx
+import pytest
+
+from opentelemetry import trace
+from opentelemetry.instrumentation.httpx import _inject_propagation_headers
+from opentelemetry.sdk.trace import TracerProvider
+
+tracer = TracerProvider().get_tracer(__name__)
+
+
+def _request(header_count):
+    headers = {f"x-header-{i}": "value" for i in range(header_count)}
+    return httpx.Request("GET", "http://downstream:8000/", headers=headers)
+
+
+def _inject(request):
+    _inject_propagation_headers(request.headers, (request,), {})
+
+
+def _allocated_bytes(request):
+    tracemalloc.start()
+    try:
+        _inject(request)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("header_count", [4, 64])
+def test_inject(benchmark, header_count):
+    request = _request(header_count)
+    with trace.use_span(tracer.start_span("client"), end_on_exit=True):
+        _inject(request)
+        benchmark.extra_info["peak_allocated_bytes"] = _allocated_bytes(
+            request
+        )
+        benchmark(_inject, request)
@@ -0,0 +1,53 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import httpx
+import pytest
+
+from opentelemetry.instrumentation._semconv import _StabilityMode
+from opentelemetry.instrumentation.httpx import (
+    _apply_request_client_attributes_to_span,
+    _extract_parameters,
+)
+
+# A service calling a handful of fixed downstreams
+REQUESTS = [
+    httpx.Request("POST", f"http://{service}:8000/{path}", json={})
+    for service, path in (
+        ("shipping-service", "ship"),
+        ("fraud-service", "fraud/check"),
+        ("payment-service", "pay"),
+        ("inventory-service", "inventory/reserve"),
+        ("notification-service", "notify"),
+        ("user-service", "users/42?fields=address"),
+    )
+]
+
+
+def _request_attributes(semconv):
+    for request in REQUESTS:
+        method, url, _, _, _ = _extract_parameters((request,), {})
+        _apply_request_client_attributes_to_span(
+            {}, {}, url, method.decode(), semconv
+        )
+
+
+@pytest.mark.parametrize(
+    "semconv",
+    [_StabilityMode.DEFAULT, _StabilityMode.HTTP_DUP],
+    ids=["default", "http_dup"],
+)
+def test_request_attributes(benchmark, semconv):
+    benchmark(_request_attributes, semconv)
@@ -0,0 +1,77 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import httpx
+import pytest
+
+from opentelemetry import trace
+from opentelemetry.instrumentation.httpx import SyncOpenTelemetryTransport
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.trace import TracerProvider
+
+UNSAMPLED_PARENT = trace.NonRecordingSpan(
+    trace.SpanContext(
+        trace_id=0x4BF92F3577B34DA6A3CE929D0E0E4736,
+        span_id=0x00F067AA0BA902B7,
+        is_remote=True,
+        trace_flags=trace.TraceFlags(trace.TraceFlags.DEFAULT),
+    )
+)
+
+# The steps httpcore reports for a request on a new HTTP/1.1 connection
+HTTPCORE_TRACE_STEPS = (
+    "connection.connect_tcp",
+    "http11.send_request_headers",
+    "http11.send_request_body",
+    "http11.receive_response_headers",
+)
+
+
+def _handler(request):
+    return httpx.Response(200)
+
+
+class _PhaseTracingTransport(httpx.BaseTransport):
+    def handle_request(self, request):
+        trace_extension = request.extensions.get("trace")
+        for step in HTTPCORE_TRACE_STEPS if trace_extension else ():
+            trace_extension(f"{step}.started", {})
+            trace_extension(f"{step}.complete", {})
+        return httpx.Response(200)
+
+
+@pytest.mark.parametrize("sampled", [True, False])
+def test_handle_request(benchmark, sampled):
+    transport = SyncOpenTelemetryTransport(
+        httpx.MockTransport(_handler),
+        tracer_provider=TracerProvider(),
+        meter_provider=MeterProvider(),
+    )
+    request = httpx.Request("GET", "http://downstream:8000/orders?customer=42")
+    parent = trace.INVALID_SPAN if sampled else UNSAMPLED_PARENT
+    with trace.use_span(parent):
+        benchmark(transport.handle_request, request)
+
+
+@pytest.mark.parametrize("record_connection_phases", [True, False])
+def test_handle_request_connection_phases(benchmark, record_connection_phases):
+    transport = SyncOpenTelemetryTransport(
+        _PhaseTracingTransport(),
+        tracer_provider=TracerProvider(),
+        meter_provider=MeterProvider(),
+        record_connection_phases=record_connection_phases,
+    )
+    request = httpx.Request("GET", "http://downstream:8000/orders")
+    benchmark(transport.handle_request, request)
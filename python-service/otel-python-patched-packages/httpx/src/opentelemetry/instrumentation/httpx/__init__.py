@@ -199,6 +199,21 @@ Or if you are using the transport classes directly:
         response_hook=async_response_hook
     )
 
+Connection phases
+*****************
+
+For httpx >= 0.20, the instrumentation subscribes to httpcore's ``trace``
+request extension and times the phases of each request up to the response
+headers: ``pool_wait``, ``connect`` (including DNS resolution), ``tls``,
+``request_write`` and ``time_to_first_byte``. Each phase is added to the span
+as an ``http.connection.<phase>`` event and recorded in the
+``http.client.connection.phase.duration`` histogram with the peer host as
+``server.address``. A ``trace`` callback already set on the request keeps
+receiving every event. This adds a span event and a histogram point per
+phase to every request, so it is off by default: pass
+``record_connection_phases=True`` to the instrumentor, ``instrument_client``
+or the transports to turn it on.
+
 API
 ---
 """
@@ -209,6 +224,7 @@ import logging
 import typing
 from asyncio import iscoroutinefunction
 from functools import partial
+from time import time_ns
 from timeit import default_timer
 from types import TracebackType
 
@@ -248,16 +264,24 @@ from opentelemetry.instrumentation.utils import (
 )
 from opentelemetry.metrics import Histogram, MeterProvider, get_meter
 from opentelemetry.propagate import inject
+from opentelemetry.propagators.textmap import Setter
 from opentelemetry.semconv.attributes.error_attributes import ERROR_TYPE
 from opentelemetry.semconv.attributes.network_attributes import (
     NETWORK_PEER_ADDRESS,
     NETWORK_PEER_PORT,
 )
+from opentelemetry.semconv.attributes.server_attributes import SERVER_ADDRESS
 from opentelemetry.semconv.metrics import MetricInstruments
 from opentelemetry.semconv.metrics.http_metrics import (
     HTTP_CLIENT_REQUEST_DURATION,
 )
-from opentelemetry.trace import SpanKind, Tracer, TracerProvider, get_tracer
+from opentelemetry.trace import (
+    SpanKind,
+    Tracer,
+    TracerProvider,
+    get_current_span,
+    get_tracer,
+)
 from opentelemetry.trace.span import Span
 from opentelemetry.trace.status import StatusCode
 from opentelemetry.util.http import redact_url, sanitize_method
@@ -314,7 +338,7 @@ def _extract_parameters(
         # In httpx >= 0.20.0, handle_request receives a Request object
         request: httpx.Request = args[0]
         method = request.method.encode()
-        url = httpx.URL(str(request.url))
+        url = request.url
         headers = request.headers
         stream = request.stream
         extensions = request.extensions
@@ -331,13 +355,30 @@ def _extract_parameters(
     return method, url, headers, stream, extensions
 
 
+class _RawHeadersSetter(Setter[list]):
+    """Sets headers in a raw list of (name, value) byte pairs, as passed to
+    transports by httpx < 0.20."""
+
+    def set(self, carrier: list, key: str, value: str) -> None:
+        name = key.lower().encode()
+        for index in range(len(carrier) - 1, -1, -1):
+            if carrier[index][0].lower() == name:
+                del carrier[index]
+        carrier.append((name, value.encode()))
+
+
+_raw_headers_setter = _RawHeadersSetter()
+
+
 def _inject_propagation_headers(headers, args, kwargs):
-    _headers = _prepare_headers(headers)
-    inject(_headers)
     if isinstance(args[0], httpx.Request):
-        request: httpx.Request = args[0]
-        request.headers = _headers
+        # The request's own headers are mutable, so they are written in place
+        inject(args[0].headers)
+    elif isinstance(headers, list):
+        inject(headers, setter=_raw_headers_setter)
     else:
+        _headers = _prepare_headers(headers)
+        inject(_headers)
         kwargs["headers"] = _headers.raw
 
 
@@ -366,33 +407,35 @@ def _extract_response(
     return (status_code, headers, stream, extensions, http_version)
 
 
-def _apply_request_client_attributes_to_span(
-    span_attributes: dict[str, typing.Any],
-    metric_attributes: dict[str, typing.Any],
-    url: str | httpx.URL,
-    method_original: str,
-    semconv: _StabilityMode,
-):
-    url = httpx.URL(url)
-    # http semconv transition: http.method -> http.request.method
-    _set_http_method(
-        span_attributes,
-        method_original,
-        sanitize_method(method_original),
-        semconv,
-    )
+def _redact_url(url: httpx.URL) -> str:
+    # Only credentials and query parameters are ever redacted
+    if not url.userinfo and not url.query:
+        return str(url)
+    return redact_url(str(url))
 
-    # http semconv transition: http.url -> url.full
-    _set_http_url(span_attributes, redact_url(str(url)), semconv)
 
-    # Set HTTP method in metric labels
-    _set_http_method(
-        metric_attributes,
-        method_original,
-        sanitize_method(method_original),
-        semconv,
-    )
+# Bound on the origins whose attributes are cached. Services talk to a few
+# fixed downstreams, but the URLs they request may be built from input.
+_MAX_CACHED_ORIGINS = 256
+_origin_attributes: dict[
+    tuple[str, str, int | None, _StabilityMode],
+    tuple[dict[str, typing.Any], dict[str, typing.Any]],
+] = {}
 
+
+def _get_origin_attributes(
+    url: httpx.URL, semconv: _StabilityMode
+) -> tuple[dict[str, typing.Any], dict[str, typing.Any]]:
+    """Returns the span and metric attributes derived from the scheme, host
+    and port of `url`. The returned dicts are shared and must not be
+    modified."""
+    key = (url.scheme, url.host, url.port, semconv)
+    entry = _origin_attributes.get(key)
+    if entry is not None:
+        return entry
+
+    span_attributes = {}
+    metric_attributes = {}
     if _report_old(semconv):
         # TODO: Support opt-in for url.scheme in new semconv
         _set_http_scheme(metric_attributes, url.scheme, semconv)
@@ -415,6 +458,60 @@ def _apply_request_client_attributes_to_span(
             # Add metric labels
             _set_http_peer_port_client(metric_attributes, url.port, semconv)
 
+    entry = (span_attributes, metric_attributes)
+    if len(_origin_attributes) < _MAX_CACHED_ORIGINS:
+        _origin_attributes[key] = entry
+    return entry
+
+
+def _apply_request_client_attributes_to_span(
+    span_attributes: dict[str, typing.Any] | None,
+    metric_attributes: dict[str, typing.Any] | None,
+    url: str | httpx.URL,
+    method_original: str,
+    semconv: _StabilityMode,
+):
+    """Sets the request attributes of the span and of the metrics; either
+    set is skipped when its dict is None."""
+    if not isinstance(url, httpx.URL):
+        url = httpx.URL(url)
+    sanitized_method = sanitize_method(method_original)
+    origin_span_attributes, origin_metric_attributes = _get_origin_attributes(
+        url, semconv
+    )
+    if span_attributes is not None:
+        # http semconv transition: http.method -> http.request.method
+        _set_http_method(
+            span_attributes,
+            method_original,
+            sanitized_method,
+            semconv,
+        )
+
+        # http semconv transition: http.url -> url.full
+        _set_http_url(span_attributes, _redact_url(url), semconv)
+        span_attributes.update(origin_span_attributes)
+
+    if metric_attributes is not None:
+        # Set HTTP method in metric labels
+        _set_http_method(
+            metric_attributes,
+            method_original,
+            sanitized_method,
+            semconv,
+        )
+        metric_attributes.update(origin_metric_attributes)
+
+
+def _parent_not_sampled() -> bool:
+    """Whether the current span is a valid, unsampled parent.
+
+    Parent-based samplers, the SDK default, never record the children of
+    such a span, so the client span's attributes are not built up front.
+    """
+    span_context = get_current_span().get_span_context()
+    return span_context.is_valid and not span_context.trace_flags.sampled
+
 
 def _apply_response_client_attributes_to_span(
     span: Span,
@@ -475,6 +572,254 @@ def _apply_response_client_attributes_to_metrics(
         )
 
 
+# Bucket bounds, in seconds, of ``http.client.instrumentation.overhead``
+_OVERHEAD_BUCKETS = (
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+)
+_OVERHEAD_PHASE_ATTRIBUTES = {
+    phase: {"otel.instrumentation.phase": phase}
+    for phase in (
+        "attributes",
+        "span_start",
+        "propagation",
+        "metrics",
+        "span_end",
+    )
+}
+
+
+def _create_overhead_histogram(meter) -> Histogram:
+    return meter.create_histogram(
+        name="http.client.instrumentation.overhead",
+        unit="s",
+        description="Time spent in the httpx instrumentation itself while sending a request.",
+        explicit_bucket_boundaries_advisory=_OVERHEAD_BUCKETS,
+    )
+
+
+class _OverheadTimer:
+    """Per-phase time spent in `_wrap`/`_async_wrap` for one request.
+    The transport and the hooks are excluded with `skip`."""
+
+    __slots__ = ("_histogram", "_last", "totals")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self.totals = {}
+        self._last = default_timer()
+
+    def mark(self, phase: str):
+        now = default_timer()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def skip(self):
+        self._last = default_timer()
+
+    def record(self):
+        for phase, seconds in self.totals.items():
+            self._histogram.record(seconds, _OVERHEAD_PHASE_ATTRIBUTES[phase])
+
+
+class _NoOverheadTimer:
+    __slots__ = ()
+
+    def mark(self, phase: str):
+        pass
+
+    def skip(self):
+        pass
+
+    def record(self):
+        pass
+
+
+_NO_OVERHEAD_TIMER = _NoOverheadTimer()
+
+# Upper bounds, in seconds, of the connection phase histogram buckets
+_CONNECTION_PHASE_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Phases timed from the steps httpcore reports to the ``trace`` request
+# extension. DNS resolution happens inside ``connect_tcp`` and is part of
+# the connect phase.
+_CONNECTION_PHASE_STEPS = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "request_write",
+    "send_request_body": "request_write",
+    "receive_response_headers": "time_to_first_byte",
+}
+_CONNECTION_PHASE_ATTRIBUTE = "http.connection.phase"
+_CONNECTION_PHASE_DURATION_ATTRIBUTE = "http.connection.phase.duration"
+_CONNECTION_PHASE_EVENTS = {
+    phase: f"http.connection.{phase}"
+    for phase in (
+        "pool_wait",
+        "connect",
+        "tls",
+        "request_write",
+        "time_to_first_byte",
+    )
+}
+
+
+class _ConnectionPhases:
+    """Histogram of the time outbound requests spend in each connection
+    phase, by peer host."""
+
+    __slots__ = ("_histogram", "_attributes")
+
+    def __init__(self, meter):
+        self._histogram = meter.create_histogram(
+            name="http.client.connection.phase.duration",
+            unit="s",
+            description="Duration of the phases of outbound HTTP requests, up to the response headers.",
+            explicit_bucket_boundaries_advisory=_CONNECTION_PHASE_BUCKETS,
+        )
+        self._attributes = {}
+
+    def record(self, host: str, timings: dict[str, list[float]]):
+        for phase, (_, seconds) in timings.items():
+            key = (host, phase)
+            attributes = self._attributes.get(key)
+            if attributes is None:
+                attributes = {
+                    SERVER_ADDRESS: host,
+                    _CONNECTION_PHASE_ATTRIBUTE: phase,
+                }
+                if len(self._attributes) < _MAX_CACHED_ORIGINS:
+                    self._attributes[key] = attributes
+            self._histogram.record(seconds, attributes)
+
+
+class _ConnectionPhaseTimer:
+    """Times the connection phases of one request from the events httpcore
+    sends to the ``trace`` request extension.
+
+    The callback is set in the request's extensions until `finish`, and
+    calls on to any callback the caller had set. httpcore sends no event
+    for acquiring a connection from the pool, so the pool wait phase is the
+    time until the first event.
+    """
+
+    __slots__ = (
+        "_phases",
+        "_host",
+        "_extensions",
+        "_chained",
+        "_start",
+        "_started",
+        "_timings",
+    )
+
+    def __init__(
+        self,
+        phases: _ConnectionPhases,
+        host: str,
+        extensions: dict[str, typing.Any],
+        asynchronous: bool,
+    ):
+        self._phases = phases
+        self._host = host
+        self._extensions = extensions
+        self._chained = extensions.get("trace")
+        # Maps a phase to its first start and its total duration
+        self._timings = {}
+        self._started = {}
+        extensions["trace"] = self.atrace if asynchronous else self.trace
+        self._start = default_timer()
+
+    def _event(self, event_name: str):
+        now = default_timer()
+        if not self._timings:
+            self._timings["pool_wait"] = [self._start, now - self._start]
+        # Event names are "<module>.<step>.<started|complete|failed>"
+        step, _, outcome = event_name.rpartition(".")
+        phase = _CONNECTION_PHASE_STEPS.get(step.rpartition(".")[2])
+        if phase is None:
+            return
+        if outcome == "started":
+            self._started[phase] = now
+            return
+        started = self._started.pop(phase, None)
+        if started is None:
+            return
+        timing = self._timings.get(phase)
+        if timing is None:
+            self._timings[phase] = [started, now - started]
+        else:
+            timing[1] += now - started
+
+    def trace(self, event_name: str, info: dict[str, typing.Any]):
+        self._event(event_name)
+        if self._chained is not None:
+            self._chained(event_name, info)
+
+    async def atrace(self, event_name: str, info: dict[str, typing.Any]):
+        self._event(event_name)
+        if self._chained is not None:
+            await self._chained(event_name, info)
+
+    def finish(self, span: Span):
+        """Restores the request's extensions and records the phases seen so
+        far; the response body is read after the span ends."""
+        if self._chained is None:
+            self._extensions.pop("trace", None)
+        else:
+            self._extensions["trace"] = self._chained
+        if not self._timings:
+            return
+        self._phases.record(self._host, self._timings)
+        if span.is_recording():
+            now = default_timer()
+            now_ns = time_ns()
+            for phase, (start, seconds) in self._timings.items():
+                span.add_event(
+                    _CONNECTION_PHASE_EVENTS[phase],
+                    {_CONNECTION_PHASE_DURATION_ATTRIBUTE: seconds},
+                    timestamp=now_ns - int((now - start) * 1e9),
+                )
+
+
+def _start_connection_phase_timer(
+    connection_phases: _ConnectionPhases | None,
+    url: httpx.URL,
+    args: tuple[typing.Any, ...],
+    asynchronous: bool,
+) -> _ConnectionPhaseTimer | None:
+    # httpcore only reports connection phases for httpx >= 0.20 requests
+    if connection_phases is None or not isinstance(args[0], httpx.Request):
+        return None
+    return _ConnectionPhaseTimer(
+        connection_phases, url.host, args[0].extensions, asynchronous
+    )
+
+
 class SyncOpenTelemetryTransport(httpx.BaseTransport):
     """Sync transport class that will trace all requests made with a client.
 
@@ -486,6 +831,9 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
             right after the span is created
         response_hook: A hook that receives the span, request, and response
             that is called right before the span ends
+        record_connection_phases: Record the connection phases of requests
+            as span events and in the ``http.client.connection.phase.duration``
+            histogram
     """
 
     def __init__(
@@ -495,6 +843,7 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
         meter_provider: MeterProvider | None = None,
         request_hook: RequestHook | None = None,
         response_hook: ResponseHook | None = None,
+        record_connection_phases: bool = False,
     ):
         _OpenTelemetrySemanticConventionStability._initialize()
         self._sem_conv_opt_in_mode = _OpenTelemetrySemanticConventionStability._get_opentelemetry_stability_opt_in_mode(
@@ -534,6 +883,9 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
             )
         self._request_hook = request_hook
         self._response_hook = response_hook
+        self._connection_phases = (
+            _ConnectionPhases(meter) if record_connection_phases else None
+        )
 
     def __enter__(self) -> SyncOpenTelemetryTransport:
         self._transport.__enter__()
@@ -565,7 +917,10 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
         )
         method_original = method.decode()
         span_name = _get_default_span_name(method_original)
-        span_attributes = {}
+        hooked = callable(self._request_hook) or callable(self._response_hook)
+        # Span attributes are skipped for spans that won't be recorded
+        lean = not hooked and _parent_not_sampled()
+        span_attributes = None if lean else {}
         metric_attributes = {}
         # apply http client response attributes according to semconv
         _apply_request_client_attributes_to_span(
@@ -576,16 +931,34 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
             self._sem_conv_opt_in_mode,
         )
 
-        request_info = RequestInfo(method, url, headers, stream, extensions)
+        request_info = (
+            RequestInfo(method, url, headers, stream, extensions)
+            if hooked
+            else None
+        )
 
         with self._tracer.start_as_current_span(
             span_name, kind=SpanKind.CLIENT, attributes=span_attributes
         ) as span:
+            if lean and span.is_recording():
+                # The sampler does not follow the parent; set what it missed
+                span_attributes = {}
+                _apply_request_client_attributes_to_span(
+                    span_attributes,
+                    None,
+                    url,
+                    method_original,
+                    self._sem_conv_opt_in_mode,
+                )
+                span.set_attributes(span_attributes)
             exception = None
             if callable(self._request_hook):
                 self._request_hook(span, request_info)
 
             _inject_propagation_headers(headers, args, kwargs)
+            phase_timer = _start_connection_phase_timer(
+                self._connection_phases, url, args, asynchronous=False
+            )
 
             start_time = default_timer()
 
@@ -596,6 +969,8 @@ class SyncOpenTelemetryTransport(httpx.BaseTransport):
                 response = getattr(exc, "response", None)
             finally:
                 elapsed_time = max(default_timer() - start_time, 0)
+                if phase_timer is not None:
+                    phase_timer.finish(span)
 
             if isinstance(response, (httpx.Response, tuple)):
                 status_code, headers, stream, extensions, http_version = (
@@ -680,6 +1055,9 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
             right after the span is created
         response_hook: A hook that receives the span, request, and response
             that is called right before the span ends
+        record_connection_phases: Record the connection phases of requests
+            as span events and in the ``http.client.connection.phase.duration``
+            histogram
     """
 
     def __init__(
@@ -689,6 +1067,7 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
         meter_provider: MeterProvider | None = None,
         request_hook: AsyncRequestHook | None = None,
         response_hook: AsyncResponseHook | None = None,
+        record_connection_phases: bool = False,
     ):
         _OpenTelemetrySemanticConventionStability._initialize()
         self._sem_conv_opt_in_mode = _OpenTelemetrySemanticConventionStability._get_opentelemetry_stability_opt_in_mode(
@@ -730,6 +1109,9 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
 
         self._request_hook = request_hook
         self._response_hook = response_hook
+        self._connection_phases = (
+            _ConnectionPhases(meter) if record_connection_phases else None
+        )
 
     async def __aenter__(self) -> "AsyncOpenTelemetryTransport":
         await self._transport.__aenter__()
@@ -759,7 +1141,10 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
         )
         method_original = method.decode()
         span_name = _get_default_span_name(method_original)
-        span_attributes = {}
+        hooked = callable(self._request_hook) or callable(self._response_hook)
+        # Span attributes are skipped for spans that won't be recorded
+        lean = not hooked and _parent_not_sampled()
+        span_attributes = None if lean else {}
         metric_attributes = {}
         # apply http client response attributes according to semconv
         _apply_request_client_attributes_to_span(
@@ -770,16 +1155,34 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
             self._sem_conv_opt_in_mode,
         )
 
-        request_info = RequestInfo(method, url, headers, stream, extensions)
+        request_info = (
+            RequestInfo(method, url, headers, stream, extensions)
+            if hooked
+            else None
+        )
 
         with self._tracer.start_as_current_span(
             span_name, kind=SpanKind.CLIENT, attributes=span_attributes
         ) as span:
+            if lean and span.is_recording():
+                # The sampler does not follow the parent; set what it missed
+                span_attributes = {}
+                _apply_request_client_attributes_to_span(
+                    span_attributes,
+                    None,
+                    url,
+                    method_original,
+                    self._sem_conv_opt_in_mode,
+                )
+                span.set_attributes(span_attributes)
             exception = None
             if callable(self._request_hook):
                 await self._request_hook(span, request_info)
 
             _inject_propagation_headers(headers, args, kwargs)
+            phase_timer = _start_connection_phase_timer(
+                self._connection_phases, url, args, asynchronous=True
+            )
 
             start_time = default_timer()
 
@@ -792,6 +1195,8 @@ class AsyncOpenTelemetryTransport(httpx.AsyncBaseTransport):
                 response = getattr(exc, "response", None)
             finally:
                 elapsed_time = max(default_timer() - start_time, 0)
+                if phase_timer is not None:
+                    phase_timer.finish(span)
 
             if isinstance(response, (httpx.Response, tuple)):
                 status_code, headers, stream, extensions, http_version = (
@@ -890,6 +1295,13 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                     and response that is called right before the span ends
                 ``async_request_hook``: Async ``request_hook`` for ``httpx.AsyncClient``
                 ``async_response_hook``: Async``response_hook`` for ``httpx.AsyncClient``
+                ``measure_overhead``: Record the time spent in the instrumentation
+                    itself, excluding the transport, in the
+                    ``http.client.instrumentation.overhead`` histogram by phase
+                ``record_connection_phases``: Record the connection phases of
+                    requests as span events and in the
+                    ``http.client.connection.phase.duration`` histogram,
+                    defaults to False
         """
         tracer_provider = kwargs.get("tracer_provider")
         meter_provider = kwargs.get("meter_provider")
@@ -907,6 +1319,10 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
             if iscoroutinefunction(async_response_hook)
             else None
         )
+        measure_overhead = kwargs.get("measure_overhead", False)
+        record_connection_phases = kwargs.get(
+            "record_connection_phases", False
+        )
 
         _OpenTelemetrySemanticConventionStability._initialize()
         sem_conv_opt_in_mode = _OpenTelemetrySemanticConventionStability._get_opentelemetry_stability_opt_in_mode(
@@ -943,6 +1359,12 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 description="Duration of HTTP client requests.",
                 explicit_bucket_boundaries_advisory=HTTP_DURATION_HISTOGRAM_BUCKETS_NEW,
             )
+        overhead = (
+            _create_overhead_histogram(meter) if measure_overhead else None
+        )
+        connection_phases = (
+            _ConnectionPhases(meter) if record_connection_phases else None
+        )
 
         wrap_function_wrapper(
             "httpx",
@@ -955,6 +1377,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                 request_hook=request_hook,
                 response_hook=response_hook,
+                overhead=overhead,
+                connection_phases=connection_phases,
             ),
         )
         wrap_function_wrapper(
@@ -968,6 +1392,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                 async_request_hook=async_request_hook,
                 async_response_hook=async_response_hook,
+                overhead=overhead,
+                connection_phases=connection_phases,
             ),
         )
 
@@ -987,16 +1413,26 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
         sem_conv_opt_in_mode: _StabilityMode,
         request_hook: RequestHook,
         response_hook: ResponseHook,
+        overhead: Histogram | None = None,
+        connection_phases: _ConnectionPhases | None = None,
     ):
         if not is_http_instrumentation_enabled():
             return wrapped(*args, **kwargs)
 
+        timer = (
+            _OverheadTimer(overhead)
+            if overhead is not None
+            else _NO_OVERHEAD_TIMER
+        )
         method, url, headers, stream, extensions = _extract_parameters(
             args, kwargs
         )
         method_original = method.decode()
         span_name = _get_default_span_name(method_original)
-        span_attributes = {}
+        hooked = callable(request_hook) or callable(response_hook)
+        # Span attributes are skipped for spans that won't be recorded
+        lean = not hooked and _parent_not_sampled()
+        span_attributes = None if lean else {}
         metric_attributes = {}
         # apply http client response attributes according to semconv
         _apply_request_client_attributes_to_span(
@@ -1007,16 +1443,39 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
             sem_conv_opt_in_mode,
         )
 
-        request_info = RequestInfo(method, url, headers, stream, extensions)
+        request_info = (
+            RequestInfo(method, url, headers, stream, extensions)
+            if hooked
+            else None
+        )
+        timer.mark("attributes")
 
         with tracer.start_as_current_span(
             span_name, kind=SpanKind.CLIENT, attributes=span_attributes
         ) as span:
+            if lean and span.is_recording():
+                # The sampler does not follow the parent; set what it missed
+                span_attributes = {}
+                _apply_request_client_attributes_to_span(
+                    span_attributes,
+                    None,
+                    url,
+                    method_original,
+                    sem_conv_opt_in_mode,
+                )
+                span.set_attributes(span_attributes)
+            timer.mark("span_start")
             exception = None
             if callable(request_hook):
                 request_hook(span, request_info)
 
+            timer.skip()
             _inject_propagation_headers(headers, args, kwargs)
+            timer.mark("propagation")
+            phase_timer = _start_connection_phase_timer(
+                connection_phases, url, args, asynchronous=False
+            )
+            timer.mark("metrics")
 
             start_time = default_timer()
 
@@ -1027,6 +1486,10 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 response = getattr(exc, "response", None)
             finally:
                 elapsed_time = max(default_timer() - start_time, 0)
+                timer.skip()
+                if phase_timer is not None:
+                    phase_timer.finish(span)
+                    timer.mark("metrics")
 
             if isinstance(response, (httpx.Response, tuple)):
                 status_code, headers, stream, extensions, http_version = (
@@ -1050,6 +1513,7 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                         http_version,
                         sem_conv_opt_in_mode,
                     )
+                timer.mark("attributes")
                 if callable(response_hook):
                     response_hook(
                         span,
@@ -1057,6 +1521,7 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                         ResponseInfo(status_code, headers, stream, extensions),
                     )
 
+            timer.skip()
             if exception:
                 if span.is_recording() and _report_new(sem_conv_opt_in_mode):
                     span.set_attribute(
@@ -1091,7 +1556,10 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                     attributes=duration_attrs_new,
                     context=context.get_current(),
                 )
+            timer.mark("metrics")
 
+        timer.mark("span_end")
+        timer.record()
         return response
 
     @staticmethod
@@ -1106,16 +1574,26 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
         sem_conv_opt_in_mode: _StabilityMode,
         async_request_hook: AsyncRequestHook,
         async_response_hook: AsyncResponseHook,
+        overhead: Histogram | None = None,
+        connection_phases: _ConnectionPhases | None = None,
     ):
         if not is_http_instrumentation_enabled():
             return await wrapped(*args, **kwargs)
 
+        timer = (
+            _OverheadTimer(overhead)
+            if overhead is not None
+            else _NO_OVERHEAD_TIMER
+        )
         method, url, headers, stream, extensions = _extract_parameters(
             args, kwargs
         )
         method_original = method.decode()
         span_name = _get_default_span_name(method_original)
-        span_attributes = {}
+        hooked = callable(async_request_hook) or callable(async_response_hook)
+        # Span attributes are skipped for spans that won't be recorded
+        lean = not hooked and _parent_not_sampled()
+        span_attributes = None if lean else {}
         metric_attributes = {}
         # apply http client response attributes according to semconv
         _apply_request_client_attributes_to_span(
@@ -1126,16 +1604,39 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
             sem_conv_opt_in_mode,
         )
 
-        request_info = RequestInfo(method, url, headers, stream, extensions)
+        request_info = (
+            RequestInfo(method, url, headers, stream, extensions)
+            if hooked
+            else None
+        )
+        timer.mark("attributes")
 
         with tracer.start_as_current_span(
             span_name, kind=SpanKind.CLIENT, attributes=span_attributes
         ) as span:
+            if lean and span.is_recording():
+                # The sampler does not follow the parent; set what it missed
+                span_attributes = {}
+                _apply_request_client_attributes_to_span(
+                    span_attributes,
+                    None,
+                    url,
+                    method_original,
+                    sem_conv_opt_in_mode,
+                )
+                span.set_attributes(span_attributes)
+            timer.mark("span_start")
             exception = None
             if callable(async_request_hook):
                 await async_request_hook(span, request_info)
 
+            timer.skip()
             _inject_propagation_headers(headers, args, kwargs)
+            timer.mark("propagation")
+            phase_timer = _start_connection_phase_timer(
+                connection_phases, url, args, asynchronous=True
+            )
+            timer.mark("metrics")
 
             start_time = default_timer()
 
@@ -1146,6 +1647,10 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 response = getattr(exc, "response", None)
             finally:
                 elapsed_time = max(default_timer() - start_time, 0)
+                timer.skip()
+                if phase_timer is not None:
+                    phase_timer.finish(span)
+                    timer.mark("metrics")
 
             if isinstance(response, (httpx.Response, tuple)):
                 status_code, headers, stream, extensions, http_version = (
@@ -1170,6 +1675,7 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                         sem_conv_opt_in_mode,
                     )
 
+                timer.mark("attributes")
                 if callable(async_response_hook):
                     await async_response_hook(
                         span,
@@ -1177,6 +1683,7 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                         ResponseInfo(status_code, headers, stream, extensions),
                     )
 
+            timer.skip()
             if exception:
                 if span.is_recording() and _report_new(sem_conv_opt_in_mode):
                     span.set_attribute(
@@ -1208,7 +1715,10 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                     attributes=duration_attrs_new,
                     context=context.get_current(),
                 )
+            timer.mark("metrics")
 
+        timer.mark("span_end")
+        timer.record()
         return response
 
     # pylint: disable=too-many-branches
@@ -1220,6 +1730,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
         meter_provider: MeterProvider | None = None,
         request_hook: RequestHook | AsyncRequestHook | None = None,
         response_hook: ResponseHook | AsyncResponseHook | None = None,
+        measure_overhead: bool = False,
+        record_connection_phases: bool = False,
     ) -> None:
         """Instrument httpx Client or AsyncClient
 
@@ -1231,6 +1743,12 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 right after the span is created
             response_hook: A hook that receives the span, request, and response
                 that is called right before the span ends
+            measure_overhead: Record the time spent in the instrumentation
+                itself, excluding the transport, in the
+                ``http.client.instrumentation.overhead`` histogram by phase
+            record_connection_phases: Record the connection phases of
+                requests as span events and in the
+                ``http.client.connection.phase.duration`` histogram
         """
 
         if getattr(client, "_is_instrumented_by_opentelemetry", False):
@@ -1272,6 +1790,12 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                 description="Duration of HTTP client requests.",
                 explicit_bucket_boundaries_advisory=HTTP_DURATION_HISTOGRAM_BUCKETS_NEW,
             )
+        overhead = (
+            _create_overhead_histogram(meter) if measure_overhead else None
+        )
+        connection_phases = (
+            _ConnectionPhases(meter) if record_connection_phases else None
+        )
 
         if iscoroutinefunction(request_hook):
             async_request_hook = request_hook
@@ -1299,6 +1823,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                     sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                     request_hook=request_hook,
                     response_hook=response_hook,
+                    overhead=overhead,
+                    connection_phases=connection_phases,
                 ),
             )
             for transport in client._mounts.values():
@@ -1314,6 +1840,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                             sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                             request_hook=request_hook,
                             response_hook=response_hook,
+                            overhead=overhead,
+                            connection_phases=connection_phases,
                         ),
                     )
             client._is_instrumented_by_opentelemetry = True
@@ -1329,6 +1857,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                     sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                     async_request_hook=async_request_hook,
                     async_response_hook=async_response_hook,
+                    overhead=overhead,
+                    connection_phases=connection_phases,
                 ),
             )
             for transport in client._mounts.values():
@@ -1344,6 +1874,8 @@ class HTTPXClientInstrumentor(BaseInstrumentor):
                             sem_conv_opt_in_mode=sem_conv_opt_in_mode,
                             async_request_hook=async_request_hook,
                             async_response_hook=async_response_hook,
+                            overhead=overhead,
+                            connection_phases=connection_phases,
                         ),
                     )
             client._is_instrumented_by_opentelemetry = True
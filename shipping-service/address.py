@@ -0,0 +1,76 @@
+import json
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# keyword -> rule; "zone" overrides the destination zone, "fee" is added to the
+# carrier quote, and "slow"/"error" drive the chaos scenarios
+DEFAULT_RULES = {
+    "INTERNATIONAL": {"zone": "international"},
+    "SLOW": {"slow": True},
+    "ERROR": {"error": True},
+}
+
+
+@dataclass(frozen=True)
+class AddressClass:
+    zone: str = "domestic"
+    fee: float = 0.0
+    slow: bool = False
+    error: bool = False
+
+    @property
+    def international(self) -> bool:
+        return self.zone == "international"
+
+
+DOMESTIC = AddressClass()
+
+
+class AddressClassifier:
+    """
+    Classifies addresses against a keyword table. All keywords are compiled
+    into one alternation so the normalized address is scanned once, and
+    results are memoized per raw address in a bounded LRU.
+    """
+
+    def __init__(self, rules=None, cache_size: int = 4096):
+        self.rules = {keyword.upper(): rule for keyword, rule in (rules or DEFAULT_RULES).items()}
+        # Longest first so overlapping keywords prefer the most specific match
+        keywords = sorted(self.rules, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(k) for k in keywords))
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+        # Results are shared per distinct keyword combination
+        self._combined = {}
+
+    @classmethod
+    def from_file(cls, path: str, cache_size: int = 4096):
+        with open(path) as f:
+            rules = json.load(f)
+        logger.info(f"Loaded {len(rules)} address rules from {path}")
+        return cls(rules, cache_size)
+
+    def _classify(self, address: str) -> AddressClass:
+        found = self.pattern.findall(address.upper())
+        if not found:
+            return DOMESTIC
+        keywords = frozenset(found)
+        result = self._combined.get(keywords)
+        if result is None:
+            result = self._combined[keywords] = self._combine(keywords)
+        return result
+
+    def _combine(self, keywords) -> AddressClass:
+        zone = "domestic"
+        fee = 0.0
+        slow = error = False
+        for keyword in sorted(keywords):
+            rule = self.rules[keyword]
+            zone = rule.get("zone", zone)
+            fee += rule.get("fee", 0.0)
+            slow = slow or rule.get("slow", False)
+            error = error or rule.get("error", False)
+        return AddressClass(zone, fee, slow, error)
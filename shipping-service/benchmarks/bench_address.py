@@ -0,0 +1,62 @@
+"""
+Microbenchmark for address classification.
+
+Compares per-keyword substring scans (what ship_order used to do) against
+AddressClassifier on large synthetic corpora, with and without repeat
+addresses, for the default table and a larger configured keyword table.
+
+    python benchmarks/bench_address.py [corpus_size]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from address import DEFAULT_RULES, AddressClassifier  # noqa: E402
+
+STREETS = ["Main St", "Oak Ave", "Maple Rd", "Harbor Blvd", "Station Sq", "Hill Ln"]
+CITIES = ["Springfield", "Riverton", "Lakeside", "Fairview", "Georgetown"]
+TAGS = ["", "", "", "", "INTERNATIONAL", "SLOW", "ERROR", "International Priority"]
+
+
+def make_corpus(size: int, unique: int, seed: int = 42):
+    rng = random.Random(seed)
+    pool = [
+        f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, Apt {rng.randint(1, 500)}, "
+        f"{rng.choice(CITIES)} {rng.randint(10000, 99999)} {rng.choice(TAGS)}"
+        for _ in range(unique)
+    ]
+    return [rng.choice(pool) for _ in range(size)]
+
+
+# Extra region keywords standing in for a realistic zone/fee table
+LARGE_RULES = dict(DEFAULT_RULES, **{f"REGION{i:02d}": {"fee": 1.0} for i in range(60)})
+
+
+def naive(address: str, keywords):
+    return [keyword for keyword in keywords if keyword in address.upper()]
+
+
+def run(label: str, corpus, rules):
+    n = len(corpus)
+    keywords = list(rules)
+    t_naive = timeit.timeit(lambda: [naive(a, keywords) for a in corpus], number=1)
+
+    classifier = AddressClassifier(rules)
+    t_cold = timeit.timeit(lambda: [classifier.classify(a) for a in corpus], number=1)
+    t_warm = timeit.timeit(lambda: [classifier.classify(a) for a in corpus], number=1)
+    hits = classifier.classify.cache_info().hits
+
+    print(f"{label} ({n} addresses, {len(keywords)} keywords)")
+    print(f"  substring scans : {t_naive / n * 1e9:8.0f} ns/address")
+    print(f"  classifier cold : {t_cold / n * 1e9:8.0f} ns/address")
+    print(f"  classifier warm : {t_warm / n * 1e9:8.0f} ns/address  (cache hits: {hits})")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for rules in (DEFAULT_RULES, LARGE_RULES):
+        run("repeat-heavy corpus", make_corpus(size, unique=1_000), rules)
+        run("mostly-unique corpus", make_corpus(size, unique=size), rules)
@@ -0,0 +1,39 @@
+"""
+Benchmark for tracking ID generation.
+
+Reports IDs per second for single and batch allocation, and checks that IDs
+from several concurrent generators (standing in for uvicorn workers) are
+unique and sorted within each generator.
+
+    python benchmarks/bench_tracking.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tracking import TrackingIdGenerator  # noqa: E402
+
+
+def rate(label: str, count: int, fn):
+    start = time.perf_counter()
+    ids = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<20}: {count / elapsed:12,.0f} ids/s")
+    return ids
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    generator = TrackingIdGenerator()
+
+    print(f"Generating {count} tracking IDs")
+    single = rate("next_id()", count, lambda: [generator.next_id() for _ in range(count)])
+    batch = rate("allocate(1000)", count, lambda: [i for _ in range(count // 1000) for i in generator.allocate(1000)])
+    assert single == sorted(single) and batch == sorted(batch), "IDs are not monotonic"
+
+    workers = [TrackingIdGenerator() for _ in range(8)]
+    ids = [w.next_id() for _ in range(count // 8) for w in workers]
+    assert len(set(ids) | set(single) | set(batch)) == len(ids) + len(single) + len(batch), "Duplicate IDs"
+    print("  uniqueness check    : ok")
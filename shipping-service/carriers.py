@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+from opentelemetry import metrics, trace
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+meter = metrics.get_meter(__name__)
+
+quote_duration = meter.create_histogram(
+    "shipping.carrier.quote.duration",
+    unit="s",
+    description="Latency of simulated carrier quote requests",
+)
+
+
+@dataclass(frozen=True)
+class Carrier:
+    name: str
+    base_cost: float
+    international_cost: float
+    min_latency: float
+    max_latency: float
+    # Carrier whose backend stalls for "SLOW" addresses
+    legacy: bool = False
+
+
+@dataclass(frozen=True)
+class Quote:
+    carrier: str
+    cost: float
+    latency: float
+
+
+CARRIERS = (
+    Carrier("swift-post", 5.00, 25.00, 0.05, 0.20),
+    Carrier("global-freight", 6.50, 21.00, 0.10, 0.35),
+    Carrier("legacy-mail", 4.50, 27.50, 0.15, 0.40, legacy=True),
+)
+
+
+async def request_quote(carrier: Carrier, international: bool, slow: bool) -> Quote:
+    """Simulate a carrier rate API call"""
+    start = time.perf_counter()
+    outcome = "ok"
+    with tracer.start_as_current_span("carrier_quote") as span:
+        span.set_attribute("carrier.name", carrier.name)
+        try:
+            latency = random.uniform(carrier.min_latency, carrier.max_latency)
+            if slow and carrier.legacy:
+                latency += 2.0
+            await asyncio.sleep(latency)
+            cost = carrier.international_cost if international else carrier.base_cost
+            span.set_attribute("carrier.cost", cost)
+            return Quote(carrier.name, cost, time.perf_counter() - start)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            span.set_attribute("carrier.cancelled", True)
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            quote_duration.record(
+                time.perf_counter() - start,
+                {"carrier": carrier.name, "outcome": outcome},
+            )
+
+
+async def best_quote(international: bool, slow: bool, deadline: float, carriers=CARRIERS) -> Quote | None:
+    """
+    Query all carriers concurrently and return the cheapest quote received
+    before the deadline. Carriers that haven't answered by then are cancelled.
+    """
+    tasks = {
+        asyncio.create_task(request_quote(carrier, international, slow)): carrier
+        for carrier in carriers
+    }
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+    for task in pending:
+        logger.error(f"[Error] Shipping carrier {tasks[task].name} timed out after {deadline:.2f}s")
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    quotes = []
+    for task in done:
+        if task.exception() is not None:
+            logger.error(f"[Error] Shipping carrier {tasks[task].name} failed: {task.exception()}")
+            continue
+        quotes.append(task.result())
+
+    return min(quotes, key=lambda q: q.cost, default=None)
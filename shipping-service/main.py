@@ -1,37 +1,47 @@
+import json
 import logging
-import random
-import time
-from fastapi import FastAPI, HTTPException, Request
-from pydantic import BaseModel
+import os
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
+
+import telemetry
+from address import AddressClassifier
+from carriers import best_quote
+from rates import RateTable
+from span_export import create_span_processor
+from tracking import TrackingIdGenerator
+
+# Setup OpenTelemetry
+# Queue/batch/delay/timeout come from OTEL_BSP_*; SPAN_EXPORT_FALLBACK_FILE enables the file fallback
+telemetry.setup("shipping-service", instrumentors=["logging"], span_processor_factory=create_span_processor)
+tracer = trace.get_tracer(__name__)
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Setup OpenTelemetry
-resource = Resource.create({"service.name": "shipping-service"})
-trace.set_tracer_provider(TracerProvider(resource=resource))
-tracer = trace.get_tracer(__name__)
+# Carrier quotes arriving after this many seconds are abandoned
+QUOTE_DEADLINE = float(os.getenv("SHIPPING_QUOTE_DEADLINE", "0.5"))
 
-otlp_exporter = OTLPSpanExporter(endpoint="http://otel-collector:4317", insecure=True)
-span_processor = BatchSpanProcessor(otlp_exporter)
-trace.get_tracer_provider().add_span_processor(span_processor)
+# Keyword table mapping address fragments to zones, fees and chaos flags
+ADDRESS_RULES_PATH = os.getenv("SHIPPING_ADDRESS_RULES")
+address_classifier = AddressClassifier.from_file(ADDRESS_RULES_PATH) if ADDRESS_RULES_PATH else AddressClassifier()
 
-LoggingInstrumentor().instrument(set_logging_format=True)
+# Zone/weight rate table used for batch shipping
+RATE_TABLE_PATH = os.getenv("SHIPPING_RATE_TABLE")
+rate_table = RateTable.from_file(RATE_TABLE_PATH) if RATE_TABLE_PATH else RateTable()
+
+tracking_ids = TrackingIdGenerator()
 
 app = FastAPI()
-FastAPIInstrumentor.instrument_app(app)
+telemetry.instrument_app(app)
 
 class ShippingRequest(BaseModel):
     order_id: int
     address: str
+    weight_kg: float = Field(1.0, gt=0, allow_inf_nan=False)
 
 @app.get("/health")
 async def health():
@@ -41,29 +51,104 @@ async def health():
 async def ship_order(request: Request, shipping_req: ShippingRequest):
     logger.info(f"Received shipping request for order {shipping_req.order_id}")
     
-    # Address validation: Latency
-    # If address contains "SLOW", processing delayed
-    if "SLOW" in shipping_req.address.upper():
-        logger.error("[Error] Shipping carrier system timeout")
-        time.sleep(2)
+    address_class = address_classifier.classify(shipping_req.address)
 
     # Address validation: Error
     # If address contains "ERROR", return 500
-    if "ERROR" in shipping_req.address.upper():
+    if address_class.error:
         logger.error("[Error] Invalid shipping address format")
         raise HTTPException(status_code=500, detail="Shipping failed due to invalid address")
 
-    shipping_cost = 5.00
-    if "INTERNATIONAL" in shipping_req.address.upper():
-        shipping_cost = 25.00
+    # Carrier quoting: Latency
+    # If address contains "SLOW", the legacy carrier stalls and is cut off at the deadline
+    quote = await best_quote(address_class.international, address_class.slow, QUOTE_DEADLINE)
 
-    tracking_id = f"TRK-{random.randint(1000, 9999)}-{shipping_req.order_id}"
+    if quote is None:
+        logger.error("[Error] Shipping carrier system timeout")
+        carrier = "standard"
+        shipping_cost = (25.00 if address_class.international else 5.00) + address_class.fee
+    else:
+        carrier = quote.carrier
+        shipping_cost = quote.cost + address_class.fee
+
+    tracking_id = f"TRK-{tracking_ids.next_id()}-{shipping_req.order_id}"
     
-    logger.info(f"Order {shipping_req.order_id} shipped. Tracking: {tracking_id}")
+    logger.info(f"Order {shipping_req.order_id} shipped via {carrier}. Tracking: {tracking_id}")
     
     return {
         "order_id": shipping_req.order_id,
         "status": "shipped",
         "tracking_id": tracking_id,
+        "carrier": carrier,
         "cost": shipping_cost
     }
+
+def ship_from_table(shipping_req: ShippingRequest, tracking_id: str):
+    """Ship one order of a batch at table rates, without carrier quoting"""
+    address_class = address_classifier.classify(shipping_req.address)
+    if address_class.error:
+        return {
+            "order_id": shipping_req.order_id,
+            "status": "failed",
+            "reason": "Invalid shipping address",
+        }
+    try:
+        cost = rate_table.rate(address_class.zone, shipping_req.weight_kg)
+    except KeyError:
+        return {
+            "order_id": shipping_req.order_id,
+            "status": "failed",
+            "reason": f"No rates for shipping zone '{address_class.zone}'",
+        }
+    return {
+        "order_id": shipping_req.order_id,
+        "status": "shipped",
+        "tracking_id": f"TRK-{tracking_id}-{shipping_req.order_id}",
+        "carrier": "standard",
+        "cost": cost + address_class.fee,
+    }
+
+@app.post("/ship/batch")
+async def ship_batch(batch: list[ShippingRequest]):
+    logger.info(f"Received batch shipping request for {len(batch)} orders")
+
+    results = [
+        ship_from_table(shipping_req, tracking_id)
+        for shipping_req, tracking_id in zip(batch, tracking_ids.allocate(len(batch)))
+    ]
+    failed = sum(1 for result in results if result["status"] == "failed")
+    if failed:
+        logger.error(f"[Error] {failed} of {len(batch)} batch shipments failed")
+
+    return {"shipped": len(results) - failed, "failed": failed, "results": results}
+
+@app.post("/ship/batch/stream")
+async def ship_batch_stream(request: Request, chunk_size: int = Query(1000, gt=0, le=10_000)):
+    """
+    NDJSON variant for very large batches: one ShippingRequest per request
+    line, one result per response line, streamed in chunks as they are shipped.
+    """
+    # Read the body up front: Starlette's StreamingResponse also consumes receive() to watch for disconnects
+    lines = [line for line in (await request.body()).split(b"\n") if line.strip()]
+    logger.info(f"Received streaming batch shipping request for {len(lines)} orders")
+
+    def parse(line_number: int, line: bytes):
+        try:
+            return ShippingRequest.model_validate_json(line)
+        except ValidationError as e:
+            logger.error(f"[Error] Invalid batch shipping line {line_number}: {e.errors()[0]['msg']}")
+            return None
+
+    def results():
+        for start in range(0, len(lines), chunk_size):
+            chunk = lines[start:start + chunk_size]
+            out = []
+            for i, (line, tracking_id) in enumerate(zip(chunk, tracking_ids.allocate(len(chunk))), start + 1):
+                shipping_req = parse(i, line)
+                if shipping_req is None:
+                    out.append(json.dumps({"line": i, "status": "failed", "reason": "Invalid request"}))
+                else:
+                    out.append(json.dumps(ship_from_table(shipping_req, tracking_id)))
+            yield "\n".join(out) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
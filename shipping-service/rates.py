@@ -0,0 +1,44 @@
+import json
+import logging
+import math
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# zone -> (cost of the first kg, cost per additional kg)
+DEFAULT_ZONES = {
+    "domestic": (5.00, 0.50),
+    "international": (25.00, 2.00),
+}
+DEFAULT_MAX_WEIGHT_KG = 30
+
+
+class RateTable:
+    """
+    Precomputed shipping rates indexed by zone and whole-kg weight bracket.
+    Rates live in one flat array so a lookup is two index computations.
+    """
+
+    def __init__(self, zones=None, max_weight_kg: int = DEFAULT_MAX_WEIGHT_KG):
+        zones = zones or DEFAULT_ZONES
+        self.max_weight_kg = max_weight_kg
+        self.zone_index = {zone: i for i, zone in enumerate(zones)}
+        self.rates = array("d")
+        for first_kg, per_kg in zones.values():
+            self.rates.extend(first_kg + per_kg * (bracket - 1) for bracket in range(1, max_weight_kg + 1))
+
+    @classmethod
+    def from_file(cls, path: str):
+        with open(path) as f:
+            config = json.load(f)
+        zones = {zone: tuple(rate) for zone, rate in config["zones"].items()}
+        logger.info(f"Loaded rate table for {len(zones)} zones from {path}")
+        return cls(zones, config.get("max_weight_kg", DEFAULT_MAX_WEIGHT_KG))
+
+    def rate(self, zone: str, weight_kg: float) -> float:
+        """Rate for a positive, finite weight; heavier parcels are charged at the top bracket"""
+        if zone not in self.zone_index:
+            raise KeyError(f"No shipping rates for zone '{zone}'")
+        zone_offset = self.zone_index[zone] * self.max_weight_kg
+        bracket = min(math.ceil(weight_kg), self.max_weight_kg)
+        return self.rates[zone_offset + bracket - 1]
@@ -0,0 +1,190 @@
+import logging
+import os
+import struct
+import threading
+import time
+
+from opentelemetry import metrics
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+export_duration = meter.create_histogram(
+    "span_export.duration",
+    unit="s",
+    description="Time spent exporting one batch of spans",
+)
+dropped_spans = meter.create_counter(
+    "span_export.dropped",
+    unit="{span}",
+    description="Spans dropped because the export queue was full",
+)
+
+
+class ExportConfig:
+    """BatchSpanProcessor settings, read from the standard OTEL_BSP_* variables"""
+
+    def __init__(self):
+        self.max_queue_size = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "2048"))
+        self.max_export_batch_size = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))
+        self.schedule_delay_millis = int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "5000"))
+        self.export_timeout_millis = int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "30000"))
+        # When set, batches the collector rejects are written here instead of being lost
+        self.fallback_file = os.getenv("SPAN_EXPORT_FALLBACK_FILE")
+        self.fallback_max_bytes = int(os.getenv("SPAN_EXPORT_FALLBACK_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.fallback_backups = int(os.getenv("SPAN_EXPORT_FALLBACK_BACKUPS", "3"))
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Writes each batch as a length-prefixed OTLP ExportTraceServiceRequest
+    (4-byte big-endian size, then the protobuf bytes) to a size-rotated file.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")
+
+    def export(self, spans) -> SpanExportResult:
+        payload = encode_spans(spans).SerializeToString()
+        with self._lock:
+            if self._file.tell() + len(payload) + 4 > self.max_bytes:
+                self._rotate()
+            self._file.write(struct.pack(">I", len(payload)))
+            self._file.write(payload)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class MeasuredSpanExporter(SpanExporter):
+    """Records export latency and falls back to a second exporter when the first one fails"""
+
+    def __init__(self, exporter: SpanExporter, fallback: SpanExporter | None = None):
+        self.exporter = exporter
+        self.fallback = fallback
+        self.on_exported = None
+
+    def export(self, spans) -> SpanExportResult:
+        start = time.perf_counter()
+        try:
+            try:
+                result = self.exporter.export(spans)
+            except Exception:
+                # An exporter that raises instead of returning FAILURE still gets the fallback
+                logger.exception("Span exporter raised")
+                export_duration.record(time.perf_counter() - start, {"result": "exception"})
+                result = SpanExportResult.FAILURE
+            else:
+                export_duration.record(time.perf_counter() - start, {"result": result.name.lower()})
+
+            if result is not SpanExportResult.SUCCESS and self.fallback is not None:
+                logger.warning(f"Span export failed, writing {len(spans)} spans to fallback file")
+                result = self.fallback.export(spans)
+            return result
+        finally:
+            if self.on_exported is not None:
+                self.on_exported(len(spans))
+
+    def shutdown(self):
+        self.exporter.shutdown()
+        if self.fallback is not None:
+            self.fallback.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
+
+
+class BackpressureSpanProcessor(SpanProcessor):
+    """
+    Wraps a BatchSpanProcessor with admission control: spans beyond the queue
+    capacity are dropped and counted here instead of being discarded silently,
+    and the number of spans waiting for export is reported as a gauge.
+    """
+
+    def __init__(self, exporter: MeasuredSpanExporter, config: ExportConfig):
+        self.max_queue_size = config.max_queue_size
+        self._pending = 0
+        self._shutdown = False
+        self._lock = threading.Lock()
+        # The batch processor empties its queue in a forked child, so the count starts over there
+        os.register_at_fork(after_in_child=self._reset_pending)
+        exporter.on_exported = self._exported
+        self.processor = BatchSpanProcessor(
+            exporter,
+            max_queue_size=config.max_queue_size,
+            max_export_batch_size=config.max_export_batch_size,
+            schedule_delay_millis=config.schedule_delay_millis,
+            export_timeout_millis=config.export_timeout_millis,
+        )
+        meter.create_observable_gauge(
+            "span_export.queue.fill",
+            callbacks=[self._observe_fill],
+            unit="1",
+            description="Fraction of the span export queue in use",
+        )
+
+    def _reset_pending(self):
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _exported(self, count: int):
+        with self._lock:
+            self._pending -= count
+
+    def _observe_fill(self, options):
+        yield metrics.Observation(self._pending / self.max_queue_size)
+
+    def on_start(self, span, parent_context=None):
+        self.processor.on_start(span, parent_context)
+
+    def on_end(self, span):
+        if not span.context.trace_flags.sampled:
+            return
+        # Only spans the batch processor accepts are counted: it discards spans after
+        # shutdown, and those would never be exported and subtracted again
+        with self._lock:
+            if self._shutdown:
+                return
+            if self._pending >= self.max_queue_size:
+                dropped_spans.add(1)
+                return
+            self._pending += 1
+            self.processor.on_end(span)
+
+    def shutdown(self):
+        with self._lock:
+            self._shutdown = True
+        self.processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.processor.force_flush(timeout_millis)
+
+
+def create_span_processor(exporter: SpanExporter, config: ExportConfig | None = None) -> BackpressureSpanProcessor:
+    config = config or ExportConfig()
+    fallback = None
+    if config.fallback_file:
+        fallback = FileSpanExporter(config.fallback_file, config.fallback_max_bytes, config.fallback_backups)
+    return BackpressureSpanProcessor(MeasuredSpanExporter(exporter, fallback), config)
@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from rates import RateTable
+
+client = TestClient(main.app)
+
+BATCH_LINE = b'{"order_id": 1, "address": "1 Main St", "weight_kg": 2.5}\n'
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_stream_rejects_non_positive_chunk_size(chunk_size):
+    response = client.post(f"/ship/batch/stream?chunk_size={chunk_size}", content=BATCH_LINE)
+    assert response.status_code == 422
+
+
+def test_stream_ships_in_chunks():
+    response = client.post("/ship/batch/stream?chunk_size=1", content=BATCH_LINE * 3)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+
+
+@pytest.mark.parametrize("weight_kg", [0, -1, "Infinity", "NaN"])
+def test_batch_rejects_invalid_weight(weight_kg):
+    order = {"order_id": 1, "address": "1 Main St", "weight_kg": weight_kg}
+    response = client.post("/ship/batch", json=[order])
+    assert response.status_code == 422
+
+
+def test_rate_table_rejects_unknown_zone():
+    table = RateTable({"domestic": (5.0, 0.5)})
+    assert table.rate("domestic", 2.5) == 6.0
+    with pytest.raises(KeyError):
+        table.rate("international", 1.0)
+
+
+def test_batch_fails_orders_in_zones_without_rates(monkeypatch):
+    monkeypatch.setattr(main, "rate_table", RateTable({"domestic": (5.0, 0.5)}))
+    response = client.post("/ship/batch", json=[{"order_id": 1, "address": "INTERNATIONAL"}])
+    assert response.json()["results"][0]["status"] == "failed"
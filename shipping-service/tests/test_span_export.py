@@ -0,0 +1,53 @@
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from span_export import BackpressureSpanProcessor, ExportConfig, MeasuredSpanExporter
+
+
+class RaisingExporter(SpanExporter):
+    def export(self, spans):
+        raise ConnectionError("collector unreachable")
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+
+def make_spans(count):
+    tracer = TracerProvider().get_tracer(__name__)
+    spans = []
+    for _ in range(count):
+        span = tracer.start_span("span")
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def test_raising_exporter_falls_back():
+    fallback = RecordingExporter()
+    exporter = MeasuredSpanExporter(RaisingExporter(), fallback)
+    exported = []
+    exporter.on_exported = exported.append
+    spans = make_spans(2)
+
+    assert exporter.export(spans) is SpanExportResult.SUCCESS
+    assert fallback.spans == spans
+    assert exported == [2]
+
+
+def test_raising_exporter_without_fallback_fails():
+    exporter = MeasuredSpanExporter(RaisingExporter())
+    assert exporter.export(make_spans(1)) is SpanExportResult.FAILURE
+
+
+def test_spans_after_shutdown_are_not_counted():
+    processor = BackpressureSpanProcessor(MeasuredSpanExporter(RecordingExporter()), ExportConfig())
+    processor.shutdown()
+    for span in make_spans(3):
+        processor.on_end(span)
+    assert processor._pending == 0
@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+
+# Tracking IDs are 128-bit values encoded as 32 fixed-width hex characters:
+#   48-bit unix time (ms) | 30-bit per-process sequence | 50-bit random node id
+# The node id is drawn per process, so uvicorn workers only collide if two of them
+# draw the same 50-bit node id, and the sequence keeps IDs monotonic within a
+# process even within one millisecond.
+SEQUENCE_BITS = 30
+NODE_BITS = 50
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+def encode(value: int) -> str:
+    # Fixed-width hex keeps string order equal to numeric order
+    return value.to_bytes(16, "big").hex().upper()
+
+
+class TrackingIdGenerator:
+    """
+    Time-sortable tracking IDs. IDs from one process are unique and monotonic;
+    across processes uniqueness is probabilistic, resting on the random node id
+    (two workers collide only if they draw the same 50 bits).
+    """
+
+    def __init__(self):
+        self._reset()
+        # Forked workers must not inherit the parent's node id or sequence
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._node = int.from_bytes(os.urandom(8), "big") >> (64 - NODE_BITS)
+        self._last_ms = 0
+        self._sequence = 0
+
+    def _reserve(self, count: int):
+        """Reserve `count` consecutive sequence numbers; returns (ms, first sequence)"""
+        with self._lock:
+            now = time.time_ns() // 1_000_000
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            # A clock that went backwards keeps the last timestamp, so IDs stay monotonic;
+            # an exhausted sequence borrows the next millisecond
+            if self._sequence + count > MAX_SEQUENCE:
+                self._last_ms += 1
+                self._sequence = 0
+            start = self._sequence
+            self._sequence += count
+            return self._last_ms, start
+
+    def next_id(self) -> str:
+        ms, seq = self._reserve(1)
+        return encode((ms << (SEQUENCE_BITS + NODE_BITS)) | (seq << NODE_BITS) | self._node)
+
+    def allocate(self, count: int) -> list[str]:
+        """Allocate a block of IDs for bulk shipping under a single lock acquisition"""
+        if count <= 0:
+            return []
+        if count > MAX_SEQUENCE:
+            raise ValueError(f"Cannot allocate more than {MAX_SEQUENCE} tracking IDs at once")
+        ms, seq = self._reserve(count)
+        base = (ms << (SEQUENCE_BITS + NODE_BITS)) | (seq << NODE_BITS) | self._node
+        step = 1 << NODE_BITS
+        return [encode(base + i * step) for i in range(count)]